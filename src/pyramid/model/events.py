@@ -4,6 +4,34 @@ import numpy as np
 
 from pyramid.model.model import BufferData
 
+try:
+    # numba is optional, but selects events in a value range in one pass without temporary masks.
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def select_value_range(event_data: np.ndarray, value_column: int, min: float, max: float) -> np.ndarray:
+    """Copy rows of event_data with value_column in half open interval [min, max), where min or max may be None."""
+    row_count = 0
+    for row in range(event_data.shape[0]):
+        value = event_data[row, value_column]
+        if (min is None or value >= min) and (max is None or value < max):
+            row_count += 1
+
+    selected = np.empty((row_count, event_data.shape[1]), dtype=event_data.dtype)
+    selected_row = 0
+    for row in range(event_data.shape[0]):
+        value = event_data[row, value_column]
+        if (min is None or value >= min) and (max is None or value < max):
+            selected[selected_row] = event_data[row]
+            selected_row += 1
+    return selected
+
+
+if njit is not None:
+    select_value_range = njit(cache=True)(select_value_range)
+
 
 @dataclass
 class NumericEventList(BufferData):
@@ -102,9 +130,12 @@ class NumericEventList(BufferData):
 
         This modifies the event_data of this object, in place.
         """
-        value_column = value_index + 1
-        self.event_data[:, value_column] += offset
-        self.event_data[:, value_column] *= gain
+        # Operate on a view of the value column, in place, skipping steps that would leave values unchanged.
+        values = self.event_data[:, value_index + 1]
+        if offset != 0:
+            values += offset
+        if gain != 1:
+            values *= gain
 
     def get_times(self) -> np.ndarray:
         """Get just the event times, ignoring event values."""
@@ -149,6 +180,12 @@ class NumericEventList(BufferData):
         This returns a new NumericEventList with a copy of events in the requested range.
         """
         value_column = value_index + 1
+        if njit is not None:
+            return NumericEventList(select_value_range(self.event_data, value_column, min, max))
+
+        if min is None and max is None:
+            return NumericEventList(self.event_data.copy())
+
         if min is None:
             top_selector = True
         else:
@@ -126,12 +126,16 @@ class SignalChunk(BufferData):
         This modifies the signal_data in place.
         """
         if channel_id is None:
-            channel_index = True
+            samples = self.sample_data
         else:
-            channel_index = self.channel_ids.index(channel_id)
-
-        self.sample_data[:, channel_index] += offset
-        self.sample_data[:, channel_index] *= gain
+            samples = self.sample_data[:, self.channel_ids.index(channel_id)]
+
+        # Operate on samples in place, skipping steps that would leave samples unchanged.
+        # This avoids the temporary copies that come with boolean or fancy indexing.
+        if offset != 0:
+            samples += offset
+        if gain != 1:
+            samples *= gain
 
     def sample_count(self) -> int:
         """Get the number of samples in the chunk."""
@@ -1,9 +1,11 @@
 from types import TracebackType
 from typing import Any, ContextManager, Self
+from collections import deque
 import logging
+import struct
+import threading
 import uuid
 import time
-import json
 
 import numpy as np
 import zmq
@@ -14,6 +16,47 @@ from pyramid.model.signals import SignalChunk
 from pyramid.neutral_zone.readers.readers import Reader
 
 
+def numpy_to_builtin(value: Any) -> Any:
+    """Convert numpy scalars to builtin Python values for JSON serialization."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not serializable")
+
+
+try:
+    # orjson is optional, but much faster than stdlib json and works with bytes directly.
+    import orjson
+
+    def dumps_json(info: dict[str, Any]) -> bytes:
+        # Header fields like sample_num might arrive as numpy scalars, which orjson can serialize natively.
+        return orjson.dumps(info, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def loads_json(message: bytes) -> dict[str, Any]:
+        return orjson.loads(message)
+
+except ImportError:  # pragma: no cover
+    import json
+
+    def dumps_json(info: dict[str, Any]) -> bytes:
+        return json.dumps(info, default=numpy_to_builtin).encode()
+
+    def loads_json(message: bytes) -> dict[str, Any]:
+        return json.loads(message)
+
+try:
+    # msgpack is optional, for compact binary headers when Pyramid is on both ends of the connection.
+    import msgpack
+
+    def dumps_msgpack(info: dict[str, Any]) -> bytes:
+        return msgpack.packb(info, use_bin_type=True, default=numpy_to_builtin)
+
+    def loads_msgpack(message: bytes) -> dict[str, Any]:
+        return msgpack.unpackb(message, raw=False)
+
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
 # OpenEphys ZMQ message formats -- where did these come from?
 # Nice but incomplete/informal docs here:
 #   https://open-ephys.github.io/gui-docs/User-Manual/Plugins/ZMQ-Interface.html
@@ -22,26 +65,66 @@ from pyramid.neutral_zone.readers.readers import Reader
 # Actual concrete, legible server source code here:
 #   https://github.com/open-ephys-plugins/zmq-interface/blob/main/Source/ZmqInterface.cpp#L359
 
+# Message envelopes are plain ASCII, so we can encode them once, up front.
+data_envelope = b"DATA"
+event_envelope = b"EVENT"
+
+# As a Pyramid extension, headers may be msgpack instead of JSON, marked by distinct envelopes.
+data_envelope_msgpack = b"DATAM"
+event_envelope_msgpack = b"EVENTM"
+msgpack_envelopes = {data_envelope_msgpack, event_envelope_msgpack}
+
+# How msgpack encodes the header's top-level "type" key, as a short string followed by a short string value.
+msgpack_type_key = b"\xa4type"
+
+# As another Pyramid extension, high-rate events may use a fixed binary header instead of JSON or msgpack.
+event_envelope_binary = b"EVTB"
+
+# Compact JSON (orjson, Open Ephys) and stdlib json separate keys from values differently.
+json_key_separators = [b":", b": "]
+
 
 def format_heartbeat(
     uuid: str,
-    application: str = "Pyramid",
-    encoding: str = 'utf-8'
+    application: str = "Pyramid"
 ) -> bytes:
     heartbeat_info = {
         "application": application,
         "uuid": uuid,
         "type": "heartbeat"
     }
-    heartbeat_bytes = json.dumps(heartbeat_info).encode(encoding=encoding)
+    heartbeat_bytes = dumps_json(heartbeat_info)
     return heartbeat_bytes
 
 
 def parse_heartbeat(
-    message: bytes,
-    encoding: str = 'utf-8'
+    message: bytes
 ) -> dict[str, str]:
-    return json.loads(message.decode(encoding=encoding))
+    return loads_json(message)
+
+
+def format_envelope_and_header(
+    envelope: bytes,
+    header_info: dict[str, Any],
+    header_format: str = "json"
+) -> list[bytes]:
+    if header_format == "msgpack":
+        if envelope == data_envelope:
+            return [data_envelope_msgpack, dumps_msgpack(header_info)]
+        else:
+            return [event_envelope_msgpack, dumps_msgpack(header_info)]
+    return [envelope, dumps_json(header_info)]
+
+
+def parse_header(
+    parts: list[bytes]
+) -> dict[str, Any]:
+    envelope = parts[0]
+    if envelope in msgpack_envelopes:
+        return loads_msgpack(parts[1])
+    if envelope == event_envelope_binary:
+        return parse_binary_event_header(parts)
+    return loads_json(parts[1])
 
 
 def format_continuous_data(
@@ -52,8 +135,8 @@ def format_continuous_data(
     sample_rate: float,
     message_num: int = 0,
     timestamp: int = 0,
-    encoding: str = 'utf-8',
-) -> list[bytes]:
+    header_format: str = "json",
+) -> list:
     content_info = {
         "stream": stream_name,
         "channel_num": channel_num,
@@ -70,37 +153,121 @@ def format_continuous_data(
         "timestamp": timestamp
     }
 
-    envelope_bytes = "DATA".encode(encoding=encoding)
-    header_bytes = json.dumps(header_info).encode(encoding=encoding)
-    return [envelope_bytes, header_bytes, data.tobytes()]
+    envelope_and_header = format_envelope_and_header(data_envelope, header_info, header_format)
+
+    # Return the array itself, rather than a bytes copy -- ZMQ can send from any contiguous buffer.
+    return envelope_and_header + [np.ascontiguousarray(data)]
+
+
+def format_continuous_data_block(
+    data: np.ndarray,
+    stream_name: str,
+    channel_nums: list[int],
+    sample_num: int,
+    sample_rate: float,
+    message_num: int = 0,
+    timestamp: int = 0,
+    header_format: str = "json",
+) -> list:
+    # This is a Pyramid extension to the Open Ephys format: one message for several channels at once.
+    # Data should have shape (num_channels, num_samples) with one row per channel in channel_nums.
+    content_info = {
+        "stream": stream_name,
+        "channel_nums": channel_nums,
+        "num_samples": data.size // len(channel_nums),
+        "sample_num": sample_num,
+        "sample_rate": sample_rate
+    }
+
+    header_info = {
+        "message_num": message_num,
+        "type": "data",
+        "content": content_info,
+        "data_size": data.size * data.itemsize,
+        "timestamp": timestamp
+    }
+
+    envelope_and_header = format_envelope_and_header(data_envelope, header_info, header_format)
+
+    # Return the array itself, rather than a bytes copy -- ZMQ can send from any contiguous buffer.
+    return envelope_and_header + [np.ascontiguousarray(data)]
 
 
 def parse_continuous_data(
     parts: list[bytes],
     dtype=np.float32,
-    encoding: str = 'utf-8',
+    out: np.ndarray = None
 ) -> tuple[str, dict, np.ndarray]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
+    envelope = parts[0].decode()
+    header_info = parse_header(parts)
     data = np.frombuffer(parts[2], dtype=dtype)
+    channel_nums = header_info.get("content", {}).get("channel_nums", None)
+    if channel_nums is not None:
+        # A block of several channels at once, with one row per channel.
+        data = data.reshape([len(channel_nums), -1])
+    if out is not None:
+        # Callers that want to own their data can fill a preallocated array of any shape with the same size.
+        np.copyto(out, data.reshape(out.shape))
+        data = out
     return (envelope, header_info, data)
 
 
+# TTL event data are: event line (1 byte), event state (1 byte), ttl word (8 bytes, big-endian).
+ttl_struct = struct.Struct(">BBQ")
+
+
 def ttl_data_to_bytes(
     event_line: int,
     event_state: int,
     ttl_word: int,
 ) -> bytes:
-    return bytes([event_line, event_state]) + ttl_word.to_bytes(length=8)
+    return ttl_struct.pack(event_line, event_state, ttl_word)
 
 
 def ttl_data_from_bytes(
     data: bytes
 ) -> tuple[int, int, int]:
-    event_line = int(data[0])
-    event_state = int(data[1])
-    ttl_word = int.from_bytes(data[2:10])
-    return (event_line, event_state, ttl_word)
+    return ttl_struct.unpack_from(data)
+
+
+# Binary event headers are: message num, source node, event type, sample num, timestamp, then the stream name as utf-8.
+event_header_struct = struct.Struct(">IIIQQ")
+
+
+def format_binary_event_header(
+    stream_name: str,
+    source_node: int,
+    type: int,
+    sample_num: int,
+    message_num: int = 0,
+    timestamp: int = 0
+) -> bytes:
+    return event_header_struct.pack(message_num, source_node, type, sample_num, timestamp) + stream_name.encode()
+
+
+def parse_binary_event_header(
+    parts: list[bytes]
+) -> dict[str, Any]:
+    """Expand a binary event header into the same dictionary as a JSON event header."""
+    header = parts[1]
+    (message_num, source_node, type, sample_num, timestamp) = event_header_struct.unpack_from(header)
+    content_info = {
+        "stream": bytes(header[event_header_struct.size:]).decode(),
+        "source_node": source_node,
+        "type": type,
+        "sample_num": sample_num
+    }
+    if len(parts) > 2:
+        data_size = len(parts[2])
+    else:
+        data_size = 0
+    return {
+        "message_num": message_num,
+        "type": "event",
+        "content": content_info,
+        "data_size": data_size,
+        "timestamp": timestamp
+    }
 
 
 def format_event(
@@ -111,8 +278,19 @@ def format_event(
     sample_num: int,
     message_num: int = 0,
     timestamp: int = 0,
-    encoding: str = 'utf-8',
+    header_format: str = "json",
 ) -> list[bytes]:
+    if header_format == "binary":
+        # Skip the header dictionaries and pack the same fields directly.
+        envelope_and_header = [
+            event_envelope_binary,
+            format_binary_event_header(stream_name, source_node, type, sample_num, message_num, timestamp)
+        ]
+        if data is not None:
+            return envelope_and_header + [data]
+        else:
+            return envelope_and_header
+
     content_info = {
         "stream": stream_name,
         "source_node": source_node,
@@ -132,26 +310,55 @@ def format_event(
         "timestamp": timestamp
     }
 
-    envelope_bytes = "EVENT".encode(encoding=encoding)
-    header_bytes = json.dumps(header_info).encode(encoding=encoding)
+    envelope_and_header = format_envelope_and_header(event_envelope, header_info, header_format)
     if data is not None:
-        return [envelope_bytes, header_bytes, data]
+        return envelope_and_header + [data]
     else:
-        return [envelope_bytes, header_bytes]
+        return envelope_and_header
 
 
 def parse_event(
-    parts: list[bytes],
-    encoding: str = 'utf-8'
+    parts: list[bytes]
 ) -> tuple[str, dict, bytes]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
+    envelope = parts[0].decode()
+    header_info = parse_header(parts)
     if len(parts) > 2:
         return (envelope, header_info, parts[2])
     else:
         return (envelope, header_info, None)
 
 
+def peek_data_type(
+    parts: list[bytes]
+) -> str:
+    """Get the "type" of a received message, preferably without parsing its whole header."""
+    envelope = parts[0]
+    if envelope == data_envelope or envelope == data_envelope_msgpack:
+        return "data"
+
+    if envelope == event_envelope_binary:
+        return "event"
+
+    # Events and spikes share the "EVENT" envelope, so look for the header's top-level "type" as raw bytes.
+    # This is safe because quotes within JSON string values would be escaped,
+    # and msgpack strings are length-prefixed.
+    header = parts[1]
+    if envelope == event_envelope:
+        for separator in json_key_separators:
+            if b'"type"' + separator + b'"spike"' in header:
+                return "spike"
+            if b'"type"' + separator + b'"event"' in header:
+                return "event"
+    elif envelope == event_envelope_msgpack:
+        if msgpack_type_key + b"\xa5spike" in header:
+            return "spike"
+        if msgpack_type_key + b"\xa5event" in header:
+            return "event"
+
+    # Fall back to parsing the full header, to handle unexpected formatting or unknown message types.
+    return parse_header(parts).get("type", None)
+
+
 def format_spike(
     waveform: np.ndarray,
     stream_name: str,
@@ -162,8 +369,8 @@ def format_spike(
     threshold: list[float],
     message_num: int = 0,
     timestamp: int = 0,
-    encoding: str = 'utf-8',
-) -> list[bytes]:
+    header_format: str = "json",
+) -> list:
     if len(waveform.shape) == 2:
         num_channels = waveform.shape[0]
         num_samples = waveform.shape[1]
@@ -191,25 +398,88 @@ def format_spike(
     }
 
     # For some reason, spike envelope is "EVENT", which makes it useless -- why not "SPIKE" to make it distinct?
-    envelope_bytes = "EVENT".encode(encoding=encoding)
-    header_bytes = json.dumps(header_info).encode(encoding=encoding)
-    return [envelope_bytes, header_bytes, waveform.tobytes()]
+    envelope_and_header = format_envelope_and_header(event_envelope, header_info, header_format)
+
+    # Return the array itself, rather than a bytes copy -- ZMQ can send from any contiguous buffer.
+    return envelope_and_header + [np.ascontiguousarray(waveform)]
 
 
 def parse_spike(
     parts: list[bytes],
     dtype=np.float32,
-    encoding: str = 'utf-8',
 ) -> tuple[str, dict, np.ndarray]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
+    envelope = parts[0].decode()
+    header_info = parse_header(parts)
     spike_info = header_info.get("spike", {})
     num_channels = spike_info.get("num_channels", 1)
-    num_samples = spike_info.get("num_samples", -1)
-    waveform = np.frombuffer(parts[2], dtype=dtype).reshape([num_channels, num_samples])
+    num_samples = spike_info.get("num_samples", None)
+    if num_samples is None:
+        num_samples = len(parts[2]) // (num_channels * np.dtype(dtype).itemsize)
+
+    # Create the 2D waveform view over the payload directly, rather than via a 1D view and reshape.
+    waveform = np.ndarray([num_channels, num_samples], dtype=dtype, buffer=parts[2])
     return (envelope, header_info, waveform)
 
 
+def parse_message(
+    parts: list[bytes]
+) -> dict[str, Any]:
+    """Classify and parse a received message in one pass: header fields plus "envelope" and parsed payload.
+
+    Returns {} for messages that Pyramid doesn't use, like non-ttl events.
+    """
+    data_type = peek_data_type(parts)
+
+    # Each parsed header_info is a new dict, so we can add to it and return it as the results, without copying.
+    if data_type == "data":
+        (envelope, results, data) = parse_continuous_data(parts)
+        results["envelope"] = envelope
+        results["data"] = data
+        return results
+
+    elif data_type == "event":
+        (envelope, results, data) = parse_event(parts)
+        if results.get("content", {}).get("type", None) != 3:  # not a ttl event
+            return {}
+        (event_line, event_state, ttl_word) = ttl_data_from_bytes(data)
+        results["envelope"] = envelope
+        results["event_line"] = event_line
+        results["event_state"] = event_state
+        results["ttl_word"] = ttl_word
+        return results
+
+    elif data_type == "spike":
+        (envelope, results, waveform) = parse_spike(parts)
+        results["envelope"] = envelope
+        results["waveform"] = waveform
+        return results
+
+    else:  # pragma: no cover
+        logging.warning(f"OpenEphysZmqClient ignoring unknown data type: {data_type}")
+        return {}
+
+
+def count_contiguous_chunks(chunks: list[SignalChunk]) -> int:
+    """Count how many chunks, from the start, follow each other in time without gaps, as from dropped messages."""
+    count = 1
+    previous = chunks[0]
+    for chunk in chunks[1:]:
+        expected_time = previous.first_sample_time + previous.sample_data.shape[0] / previous.sample_frequency
+        if chunk.sample_frequency != previous.sample_frequency:
+            break
+        if abs(chunk.first_sample_time - expected_time) > 0.5 / previous.sample_frequency:
+            break
+        count += 1
+        previous = chunk
+    return count
+
+
+def warn_about_encoding(encoding: str, class_name: str) -> None:
+    """The encoding arg is deprecated -- Open Ephys always uses utf-8."""
+    if encoding.replace("-", "").lower() != "utf8":
+        logging.warning(f"{class_name} ignoring deprecated encoding {encoding}, Open Ephys always uses utf-8.")
+
+
 class OpenEphysZmqServer(ContextManager):
     """Mimic the server side the Open Ephys ZMQ plugin -- as a standin for the actual Open Ephys application.
 
@@ -227,7 +497,9 @@ class OpenEphysZmqServer(ContextManager):
         heartbeat_port: int = None,
         scheme: str = "tcp",
         timeout_ms: int = 10,
-        encoding: str = 'utf-8'
+        encoding: str = 'utf-8',
+        header_format: str = "json",
+        send_high_water_mark: int = 1000
     ) -> None:
         self.data_address = f"{scheme}://{host}:{data_port}"
 
@@ -236,14 +508,23 @@ class OpenEphysZmqServer(ContextManager):
         self.heartbeat_address = f"{scheme}://{host}:{heartbeat_port}"
 
         self.timeout_ms = timeout_ms
-        self.encoding = encoding
+        warn_about_encoding(encoding, self.__class__.__name__)
+
+        # Open Ephys itself uses JSON headers, but Pyramid can also send and receive msgpack headers,
+        # or "binary" headers for ttl events (with JSON headers for other messages).
+        if header_format == "msgpack" and msgpack is None:  # pragma: no cover
+            raise ValueError("OpenEphysZmqServer header_format 'msgpack' requires the msgpack package.")
+        self.header_format = header_format
+
+        # Limit how many messages ZMQ will queue up for each slow subscriber, before dropping new ones.
+        self.send_high_water_mark = send_high_water_mark
 
         self.message_number = None
         self.last_heartbeat = None
         self.heartbeat_count = None
 
         self.heartbeat_reply = "heartbeat received"
-        self.heartbeat_reply_bytes = self.heartbeat_reply.encode(encoding)
+        self.heartbeat_reply_bytes = self.heartbeat_reply.encode()
 
         self.context = None
         self.data_socket = None
@@ -255,6 +536,7 @@ class OpenEphysZmqServer(ContextManager):
 
         self.data_socket = self.context.socket(zmq.PUB)
         self.data_socket.setsockopt(zmq.LINGER, self.timeout_ms)
+        self.data_socket.setsockopt(zmq.SNDHWM, self.send_high_water_mark)
         self.data_socket.bind(self.data_address)
 
         self.heartbeat_socket = self.context.socket(zmq.REP)
@@ -291,7 +573,7 @@ class OpenEphysZmqServer(ContextManager):
         if self.heartbeat_socket in ready:
             bytes = self.heartbeat_socket.recv(zmq.NOBLOCK)
             if bytes:
-                self.last_heartbeat = parse_heartbeat(bytes, self.encoding)
+                self.last_heartbeat = parse_heartbeat(bytes)
                 self.heartbeat_count += 1
                 self.heartbeat_socket.send(self.heartbeat_reply_bytes)
                 return True
@@ -308,7 +590,7 @@ class OpenEphysZmqServer(ContextManager):
     ) -> int:
         message_num = self.message_number
         self.message_number += 1
-        timestamp = round(time.time() * 1000)
+        timestamp = time.time_ns() // 1_000_000
         parts = format_continuous_data(
             data,
             stream_name,
@@ -317,9 +599,33 @@ class OpenEphysZmqServer(ContextManager):
             sample_rate,
             message_num,
             timestamp,
-            self.encoding
+            header_format=self.header_format
         )
-        self.data_socket.send_multipart(parts)
+        self.data_socket.send_multipart(parts, copy=False, track=False)
+        return message_num
+
+    def send_continuous_data_block(
+        self,
+        data: np.ndarray,
+        stream_name: str,
+        channel_nums: list[int],
+        sample_num: int,
+        sample_rate: float,
+    ) -> int:
+        message_num = self.message_number
+        self.message_number += 1
+        timestamp = time.time_ns() // 1_000_000
+        parts = format_continuous_data_block(
+            data,
+            stream_name,
+            channel_nums,
+            sample_num,
+            sample_rate,
+            message_num,
+            timestamp,
+            header_format=self.header_format
+        )
+        self.data_socket.send_multipart(parts, copy=False, track=False)
         return message_num
 
     def send_ttl_event(
@@ -335,7 +641,7 @@ class OpenEphysZmqServer(ContextManager):
         self.message_number += 1
         type = 3  # ttl event
         data = ttl_data_to_bytes(event_line, event_state, ttl_word)
-        timestamp = round(time.time() * 1000)
+        timestamp = time.time_ns() // 1_000_000
         parts = format_event(
             data,
             stream_name,
@@ -344,7 +650,7 @@ class OpenEphysZmqServer(ContextManager):
             sample_num,
             message_num,
             timestamp,
-            self.encoding
+            header_format=self.header_format
         )
         self.data_socket.send_multipart(parts)
         return message_num
@@ -361,7 +667,7 @@ class OpenEphysZmqServer(ContextManager):
     ) -> int:
         message_num = self.message_number
         self.message_number += 1
-        timestamp = round(time.time() * 1000)
+        timestamp = time.time_ns() // 1_000_000
         parts = format_spike(
             waveform,
             stream_name,
@@ -372,9 +678,9 @@ class OpenEphysZmqServer(ContextManager):
             threshold,
             message_num,
             timestamp,
-            self.encoding
+            header_format=self.header_format
         )
-        self.data_socket.send_multipart(parts)
+        self.data_socket.send_multipart(parts, copy=False, track=False)
         return message_num
 
 
@@ -393,7 +699,10 @@ class OpenEphysZmqClient(ContextManager):
         scheme: str = "tcp",
         timeout_ms: int = 10,
         encoding: str = 'utf-8',
-        client_uuid: str = None
+        client_uuid: str = None,
+        receive_in_background: bool = False,
+        max_queued_messages: int = 10000,
+        receive_high_water_mark: int = 1000
     ) -> None:
         self.data_address = f"{scheme}://{host}:{data_port}"
 
@@ -403,7 +712,10 @@ class OpenEphysZmqClient(ContextManager):
             self.heartbeat_address = f"{scheme}://{host}:{heartbeat_port}"
 
         self.timeout_ms = timeout_ms
-        self.encoding = encoding
+        warn_about_encoding(encoding, self.__class__.__name__)
+
+        # Limit how many received messages ZMQ will queue up before dropping new ones.
+        self.receive_high_water_mark = receive_high_water_mark
 
         if client_uuid is None:
             client_uuid = str(uuid.uuid4())
@@ -418,6 +730,17 @@ class OpenEphysZmqClient(ContextManager):
         self.heartbeat_socket = None
         self.data_poller = None
         self.heartbeat_poller = None
+        self.combined_poller = None
+
+        # Optionally, receive data on a background thread and queue it up for poll_and_receive_data().
+        self.receive_in_background = receive_in_background
+        self.max_queued_messages = max_queued_messages
+        self.received_frames = None
+        self.frames_available = None
+        self.receive_thread = None
+        self.receive_thread_running = False
+        self.dropped_message_count = 0
+        self.dropping_messages = False
 
     def __enter__(self) -> Self:
         self.context = zmq.Context()
@@ -427,6 +750,7 @@ class OpenEphysZmqClient(ContextManager):
         self.data_socket = self.context.socket(zmq.SUB)
         self.data_socket.setsockopt(zmq.SUBSCRIBE, b'')
         self.data_socket.setsockopt(zmq.LINGER, self.timeout_ms)
+        self.data_socket.setsockopt(zmq.RCVHWM, self.receive_high_water_mark)
         self.data_socket.connect(self.data_address)
         self.data_poller = zmq.Poller()
         self.data_poller.register(self.data_socket, zmq.POLLIN)
@@ -440,9 +764,30 @@ class OpenEphysZmqClient(ContextManager):
             self.heartbeat_poller = zmq.Poller()
             self.heartbeat_poller.register(self.heartbeat_socket, zmq.POLLIN)
 
+            # A combined poller lets callers check both sockets with one poll, when they don't need separate timeouts.
+            # When receiving in the background, the data socket belongs to the background thread, so leave it out.
+            if not self.receive_in_background:
+                self.combined_poller = zmq.Poller()
+                self.combined_poller.register(self.data_socket, zmq.POLLIN)
+                self.combined_poller.register(self.heartbeat_socket, zmq.POLLIN)
+
         self.heartbeat_send_count = 0
         self.heartbeat_reply_count = 0
 
+        if self.receive_in_background:
+            # Deque appends and pops are atomic, so the background thread and caller can share it without a lock.
+            self.received_frames = deque(maxlen=self.max_queued_messages)
+            self.frames_available = threading.Event()
+            self.dropped_message_count = 0
+            self.dropping_messages = False
+            self.receive_thread_running = True
+            self.receive_thread = threading.Thread(
+                target=self.receive_in_background_loop,
+                name=f"OpenEphysZmqClient {self.data_address}",
+                daemon=True
+            )
+            self.receive_thread.start()
+
         return self
 
     def __exit__(
@@ -451,6 +796,14 @@ class OpenEphysZmqClient(ContextManager):
         __exc_value: BaseException | None,
         __traceback: TracebackType | None
     ) -> bool | None:
+        if self.receive_thread is not None:
+            # The background thread polls with a timeout, so it will notice this soon and stop using the data socket.
+            self.receive_thread_running = False
+            self.receive_thread.join()
+            self.receive_thread = None
+            if self.dropped_message_count:
+                logging.warning(f"OpenEphysZmqClient dropped {self.dropped_message_count} messages in total that were queued but not read.")
+
         if self.context is not None:
             self.context.destroy()
 
@@ -459,6 +812,17 @@ class OpenEphysZmqClient(ContextManager):
         self.data_poller = None
         self.heartbeat_socket = None
         self.heartbeat_poller = None
+        self.combined_poller = None
+
+    def poll_combined(self, timeout_ms: int = None) -> dict[zmq.Socket, int]:
+        """Poll data and heartbeat sockets together, to pass the result to poll_and_receive_*(ready=...)."""
+        if self.combined_poller is None:
+            return None
+
+        if timeout_ms is None:
+            timeout_ms = self.timeout_ms
+
+        return dict(self.combined_poller.poll(timeout_ms))
 
     def send_heartbeat(self) -> bool:
         if self.heartbeat_socket is None:
@@ -473,56 +837,71 @@ class OpenEphysZmqClient(ContextManager):
         self.heartbeat_send_count += 1
         return True
 
-    def poll_and_receive_heartbeat(self, timeout_ms: int = None) -> str:
+    def poll_and_receive_heartbeat(self, timeout_ms: int = None, ready: dict[zmq.Socket, int] = None) -> str:
         if self.heartbeat_socket is None:
             return None
 
         if timeout_ms is None:
             timeout_ms = self.timeout_ms
 
-        ready = dict(self.heartbeat_poller.poll(timeout_ms))
+        if ready is None:
+            ready = dict(self.heartbeat_poller.poll(timeout_ms))
         if self.heartbeat_socket in ready:
             heartbeat_reply_bytes = self.heartbeat_socket.recv(zmq.NOBLOCK)
             if heartbeat_reply_bytes:
                 self.heartbeat_reply_count += 1
-                return heartbeat_reply_bytes.decode(self.encoding)
+                return heartbeat_reply_bytes.decode()
+        return None
+
+    def receive_in_background_loop(self) -> None:
+        """Receive data frames as they arrive and queue them up, until __exit__() stops this thread."""
+        while self.receive_thread_running:
+            ready = dict(self.data_poller.poll(self.timeout_ms))
+            if self.data_socket in ready:
+                frames = self.data_socket.recv_multipart(zmq.NOBLOCK, copy=False)
+                if frames:
+                    if len(self.received_frames) >= self.max_queued_messages:
+                        self.dropped_message_count += 1
+                        # Warn once per burst of drops, rather than once per dropped message.
+                        if not self.dropping_messages:
+                            logging.warning("OpenEphysZmqClient queue is full, dropping messages that were queued but not read.")
+                            self.dropping_messages = True
+                    else:
+                        self.dropping_messages = False
+                    # The bounded deque drops its oldest frames to make room.
+                    self.received_frames.append(frames)
+                    self.frames_available.set()
+
+    def receive_frames(self, timeout_ms: int, ready: dict[zmq.Socket, int] = None) -> list[zmq.Frame]:
+        if self.receive_in_background:
+            deadline = time.monotonic() + timeout_ms / 1000
+            while not self.received_frames:
+                # Clear before checking again, so we can't miss a set() from the background thread.
+                self.frames_available.clear()
+                if self.received_frames:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.frames_available.wait(remaining):
+                    return None
+            return self.received_frames.popleft()
+
+        if ready is None:
+            ready = dict(self.data_poller.poll(timeout_ms))
+        if self.data_socket in ready:
+            return self.data_socket.recv_multipart(zmq.NOBLOCK, copy=False)
         return None
 
-    def poll_and_receive_data(self, timeout_ms: int = None) -> dict[str, Any]:
+    def poll_and_receive_data(self, timeout_ms: int = None, ready: dict[zmq.Socket, int] = None) -> dict[str, Any]:
         if timeout_ms is None:
             timeout_ms = self.timeout_ms
 
         results = {}
-        ready = dict(self.data_poller.poll(timeout_ms))
-        if self.data_socket in ready:
-            parts = self.data_socket.recv_multipart(zmq.NOBLOCK)
-            if parts:
-                header_info = json.loads(parts[1].decode(self.encoding))
-
-                data_type = header_info["type"]
-                if data_type == "data":
-                    (envelope, header_info, data) = parse_continuous_data(parts, encoding=self.encoding)
-                    results.update(header_info)
-                    results["envelope"] = envelope
-                    results["data"] = data
-
-                elif data_type == "event":
-                    (envelope, header_info, data) = parse_event(parts, encoding=self.encoding)
-                    if header_info.get("content", {}).get("type", None) == 3:  # ttl event
-                        (event_line, event_state, ttl_word) = ttl_data_from_bytes(data)
-                        results.update(header_info)
-                        results["envelope"] = envelope
-                        results["event_line"] = event_line
-                        results["event_state"] = event_state
-                        results["ttl_word"] = ttl_word
-
-                elif data_type == "spike":
-                    (envelope, header_info, waveform) = parse_spike(parts, encoding=self.encoding)
-                    results.update(header_info)
-                    results["envelope"] = envelope
-                    results["waveform"] = waveform
-                else:  # pragma: no cover
-                    logging.warning(f"OpenEphysZmqClient ignoring unknown data type: {data_type}")
+        frames = self.receive_frames(timeout_ms, ready)
+        if frames:
+            # Copy the small envelope and header, but leave data payloads in place in the received ZMQ frames.
+            # Arrays parsed from the payloads are read-only views that keep their frames alive as needed.
+            parts = [frame.bytes for frame in frames[0:2]] + [frame.buffer for frame in frames[2:]]
+            results = parse_message(parts)
 
         return results
 
@@ -548,6 +927,11 @@ class OpenEphysZmqReader(Reader):
         scheme: str = "tcp",
         timeout_ms: int = 10,
         encoding: str = 'utf-8',
+        receive_in_background: bool = False,
+        max_queued_messages: int = 10000,
+        max_messages_per_read: int = 1,
+        ring_buffer_samples: int = None,
+        receive_high_water_mark: int = 1000
     ) -> None:
         """Create a new OpenEphysZmqReader.
 
@@ -572,7 +956,19 @@ class OpenEphysZmqReader(Reader):
             client_uuid:            unique id that this reader uses to identifiy itself ot the Open Ephys ZMQ Interface
             scheme:                 URL transport scheme to use when connecting to the Open Ephys ZMQ Interface
             timeout_ms:             how long to wait when polling for messages from the Open Ephys ZMQ Interface
-            encoding:               binary encoding to use for string data
+            encoding:               deprecated and ignored, Open Ephys always uses utf-8
+            receive_in_background:  whether to receive messages on a background thread, so that socket I/O can
+                                    overlap with parsing and Pyramid's other work (default is False, receive in read_next)
+            max_queued_messages:    when receiving in the background, how many messages to queue up before dropping
+                                    the oldest ones
+            max_messages_per_read:  how many already-received messages to combine into each read_next() result,
+                                    to reduce per-message overhead during bursts of data (default is 1)
+            ring_buffer_samples:    size of a preallocated ring buffer for each continuous data channel, to reuse
+                                    instead of allocating new arrays (default is None, no ring buffers) -- results
+                                    are views into the rings, so consumers must copy them before the rings wrap around,
+                                    as ReaderRouter does
+            receive_high_water_mark: how many received messages ZMQ may queue up before dropping new ones, to bound
+                                    memory use when Pyramid falls behind (default is 1000, same as ZMQ's default)
         """
         self.client = OpenEphysZmqClient(
             host,
@@ -581,7 +977,10 @@ class OpenEphysZmqReader(Reader):
             scheme,
             timeout_ms,
             encoding,
-            client_uuid
+            client_uuid,
+            receive_in_background,
+            max_queued_messages,
+            receive_high_water_mark
         )
 
         self.event_sample_frequency = event_sample_frequency
@@ -592,6 +991,19 @@ class OpenEphysZmqReader(Reader):
         self.heartbeat_interval = heartbeat_interval
         self.last_heartbeat_attempt = None
 
+        self.max_messages_per_read = max_messages_per_read
+
+        # Signal chunks received after a gap, to return from the next read_next().
+        self.pending_signal_chunks = {}
+
+        self.ring_buffer_samples = ring_buffer_samples
+        self.sample_rings = {}
+        self.sample_ring_cursors = {}
+        if ring_buffer_samples and continuous_data:
+            for name in continuous_data.values():
+                self.sample_rings[name] = np.empty([ring_buffer_samples, 1], dtype=np.float32)
+                self.sample_ring_cursors[name] = 0
+
     def __enter__(self) -> Self:
         self.client.__enter__()
         self.last_heartbeat_attempt = 0
@@ -634,67 +1046,154 @@ class OpenEphysZmqReader(Reader):
         return initial
 
     def read_next(self) -> dict[str, BufferData]:
+        ready = None
         if self.client.heartbeat_socket is not None:
             now_time = time.time()
             heartbeat_elapsed = now_time - self.last_heartbeat_attempt
             if heartbeat_elapsed > self.heartbeat_interval:
-                heartbeat_reply = self.client.poll_and_receive_heartbeat()
+                # Check for heartbeat replies and data at the same time, when possible.
+                ready = self.client.poll_combined()
+                heartbeat_reply = self.client.poll_and_receive_heartbeat(ready=ready)
                 if self.last_heartbeat_attempt > 0 and not heartbeat_reply:
                     logging.warning(f"Open Ephys ZMQ Interface at {self.client.data_address} has not replied to heartbeat for  at least {heartbeat_elapsed} seconds.")
                 self.client.send_heartbeat()
                 self.last_heartbeat_attempt = now_time
 
-        client_results = self.client.poll_and_receive_data()
-        if not client_results:
+        # Collect samples and event rows from several messages, if available, then make one BufferData per buffer.
+        # Start with any signal chunks left over after a gap, last time.
+        signal_chunks = self.pending_signal_chunks
+        self.pending_signal_chunks = {}
+        event_rows = {}
+        message_count = 0
+        while message_count < self.max_messages_per_read:
+            # Only wait for the first message -- after that, take what's already available.
+            if message_count == 0:
+                client_results = self.client.poll_and_receive_data(ready=ready)
+            else:
+                client_results = self.client.poll_and_receive_data(timeout_ms=0)
+            if not client_results:
+                break
+            message_count += 1
+            self.collect_client_results(client_results, signal_chunks, event_rows)
+
+        if not message_count and not signal_chunks:
             return None
 
         results = {}
+        for name, chunks in signal_chunks.items():
+            results[name] = self.combine_signal_chunks(name, chunks)
+
+        for name, rows in event_rows.items():
+            results[name] = NumericEventList(np.array(rows, dtype=np.float64))
+
+        return results
+
+    def combine_signal_chunks(self, name: str, chunks: list[SignalChunk]) -> SignalChunk:
+        """Combine consecutive chunks for the same buffer, possibly into that buffer's preallocated ring.
+
+        Only chunks that are contiguous in time are combined.
+        Messages might be dropped when Pyramid falls behind, so chunks after a gap are saved for the next read_next().
+        """
+        contiguous_count = count_contiguous_chunks(chunks)
+        if contiguous_count < len(chunks):
+            self.pending_signal_chunks[name] = chunks[contiguous_count:]
+            chunks = chunks[:contiguous_count]
+
+        ring = self.sample_rings.get(name, None)
+        sample_count = sum(chunk.sample_data.shape[0] for chunk in chunks)
+        use_ring = ring is not None and sample_count <= ring.shape[0]
+        if len(chunks) == 1 and not use_ring:
+            return chunks[0]
+
+        # The combined chunk starts where the first chunk starts.
+        first_chunk = chunks[0]
+        if not use_ring:
+            sample_data = np.concatenate([chunk.sample_data for chunk in chunks])
+        else:
+            # Fill the next region of the ring, wrapping to the start when there's not enough room at the end.
+            # This returns a view into the ring, which is valid until the ring wraps around again.
+            cursor = self.sample_ring_cursors[name]
+            if cursor + sample_count > ring.shape[0]:
+                cursor = 0
+            sample_data = ring[cursor:cursor + sample_count]
+            offset = 0
+            for chunk in chunks:
+                chunk_count = chunk.sample_data.shape[0]
+                np.copyto(sample_data[offset:offset + chunk_count], chunk.sample_data)
+                offset += chunk_count
+            self.sample_ring_cursors[name] = cursor + sample_count
+
+        return SignalChunk(
+            sample_data=sample_data,
+            sample_frequency=first_chunk.sample_frequency,
+            first_sample_time=first_chunk.first_sample_time,
+            channel_ids=first_chunk.channel_ids
+        )
+
+    def collect_client_results(
+        self,
+        client_results: dict[str, Any],
+        signal_chunks: dict[str, list[SignalChunk]],
+        event_rows: dict[str, list[list]]
+    ) -> None:
+        """Sort out one message from the client as SignalChunks and event rows, per buffer name."""
+        collected = False
         data_type = client_results.get("type", None)
         if data_type == "data":
             if self.continuous_data:
-                channel_num = client_results["content"]["channel_num"]
-                name = self.continuous_data.get(channel_num, None)
-                if name is not None:
-                    sample_num = client_results["content"]["sample_num"]
-                    sample_rate = client_results["content"]["sample_rate"]
-                    sample_data = client_results["data"]
-                    results[name] = SignalChunk(
-                        sample_data=sample_data.reshape([-1, 1]),
-                        sample_frequency=sample_rate,
-                        first_sample_time=sample_num / sample_rate,
-                        channel_ids=[int(channel_num)]
-                    )
+                content = client_results["content"]
+                channel_nums = content.get("channel_nums", None)
+                if channel_nums is None:
+                    # Open Ephys sends one channel per message.
+                    channel_data = {content["channel_num"]: client_results["data"]}
+                else:
+                    # Pyramid might send a block of several channels per message, one row per channel.
+                    channel_data = dict(zip(channel_nums, client_results["data"]))
+
+                sample_num = content["sample_num"]
+                sample_rate = content["sample_rate"]
+                for channel_num, sample_data in channel_data.items():
+                    name = self.continuous_data.get(channel_num, None)
+                    if name is not None:
+                        chunk = SignalChunk(
+                            sample_data=sample_data.reshape([-1, 1]),
+                            sample_frequency=sample_rate,
+                            first_sample_time=sample_num / sample_rate,
+                            channel_ids=[int(channel_num)]
+                        )
+                        signal_chunks.setdefault(name, []).append(chunk)
+                        collected = True
 
         elif data_type == "event":
             if self.events:
                 # [timestamp, ttl_word, event_line, event_state]
-                sample_num = client_results["content"]["sample_num"]
-                timestamp = sample_num / self.event_sample_frequency
-                ttl_word = client_results["ttl_word"]
-                event_line = client_results["event_line"]
-                event_state = client_results["event_state"]
-                event_data = [timestamp, ttl_word, event_line, event_state]
-                results[self.events] = NumericEventList(np.array([event_data], dtype=np.float64))
+                timestamp = client_results["content"]["sample_num"] / self.event_sample_frequency
+                event_data = [
+                    timestamp,
+                    client_results["ttl_word"],
+                    client_results["event_line"],
+                    client_results["event_state"]
+                ]
+                event_rows.setdefault(self.events, []).append(event_data)
+                collected = True
 
         elif data_type == "spike":
             if self.spikes:
                 # Does Open Ephys give us anything like probe contact location or index or "channel" in the Plexon sense?
                 # [timestamp, sorted_id]
-                sample_num = client_results["spike"]["sample_num"]
-                timestamp = sample_num / self.event_sample_frequency
-                sorted_id = client_results["spike"]["sorted_id"]
-                event_data = [timestamp, sorted_id]
+                spike_info = client_results["spike"]
+                timestamp = spike_info["sample_num"] / self.event_sample_frequency
+                event_data = [timestamp, spike_info["sorted_id"]]
 
                 if isinstance(self.spikes, str):
-                    results[self.spikes] = NumericEventList(np.array([event_data], dtype=np.float64))
+                    event_rows.setdefault(self.spikes, []).append(event_data)
+                    collected = True
                 elif isinstance(self.spikes, dict):
-                    electrode = client_results["spike"]["electrode"]
-                    name = self.spikes.get(electrode, None)
+                    name = self.spikes.get(spike_info["electrode"], None)
                     if name is not None:
-                        results[name] = NumericEventList(np.array([event_data], dtype=np.float64))
+                        event_rows.setdefault(name, []).append(event_data)
+                        collected = True
 
         # TODO: this is for debugging and should be removed to prevent log spam!
-        if client_results and not results:  # pragma: no cover
+        if not collected:  # pragma: no cover
             logging.warning(f"OpenEphysZmqReader ignoring unmapped data: {client_results}")
-
-        return results
@@ -1,7 +1,11 @@
-from types import TracebackType
-from typing import Self
+from types import CodeType, TracebackType
+from typing import Any, Self
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import csv
+import logging
+import mmap
+import os
 import numpy as np
 
 from pyramid.file_finder import FileFinder
@@ -9,6 +13,111 @@ from pyramid.model.model import BufferData
 from pyramid.model.events import NumericEventList
 from pyramid.neutral_zone.readers.readers import Reader
 
+try:
+    # pandas is optional, but parses cluster files and evaluates cluster filters in bulk, instead of row by row.
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+try:
+    # numexpr is optional, but evaluates numeric cluster filters for all clusters at once.
+    import numexpr
+except ImportError:  # pragma: no cover
+    numexpr = None
+
+try:
+    # numba is optional, but filters, scales, and packs each increment of spikes in one pass.
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def pack_spike_events(
+    times: np.ndarray,
+    clusters: np.ndarray,
+    keep_mask: np.ndarray,
+    sample_rate: float,
+    out: np.ndarray
+) -> int:
+    """Fill out with [time, cluster_id] rows for spikes whose clusters are in keep_mask, return the row count."""
+    last_mask_index = keep_mask.size - 1
+    count = 0
+    for index in range(times.size):
+        cluster = clusters[index]
+        if keep_mask[min(cluster, last_mask_index)]:
+            out[count, 0] = times[index] / sample_rate
+            out[count, 1] = cluster
+            count += 1
+    return count
+
+
+if njit is not None:
+    pack_spike_events = njit(cache=True, boundscheck=False)(pack_spike_events)
+
+
+# When keeping this many clusters or fewer, compare cluster ids directly instead of using a lookup mask.
+max_clusters_to_compare = 8
+
+# Errors to expect from evaluating cluster_filter with cluster info, which mean "don't keep this cluster".
+filter_errors = (NameError, TypeError, AttributeError, ValueError, ArithmeticError)
+
+
+def advise_memmap(array: np.ndarray, advice_name: str) -> None:
+    """Tell the OS how we'll use a memory-mapped array, where supported, like mmap.MADV_SEQUENTIAL."""
+    advice = getattr(mmap, advice_name, None)
+    memory_map = getattr(array, "_mmap", None)
+    if advice is not None and memory_map is not None and hasattr(memory_map, "madvise"):
+        memory_map.madvise(advice)
+
+
+def advise_file(file: Any, advice_name: str) -> None:
+    """Tell the OS how we'll use an open file, where supported, like os.POSIX_FADV_SEQUENTIAL."""
+    advice = getattr(os, advice_name, None)
+    if advice is not None and hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(file.fileno(), 0, 0, advice)
+
+
+class NpyFileReader():
+    """Read rows of a .npy file incrementally, with ordinary file reads instead of a memory map.
+
+    This parses the .npy header once, then supports slicing like spike_times[start:end], reading just those rows.
+    """
+
+    def __init__(self, npy_file: str) -> None:
+        self.npy_file = npy_file
+        self.file = open(npy_file, "rb")
+
+        # We read front to back and don't revisit rows, so let the OS read ahead aggressively and not keep pages around.
+        advise_file(self.file, "POSIX_FADV_SEQUENTIAL")
+        advise_file(self.file, "POSIX_FADV_NOREUSE")
+
+        version = np.lib.format.read_magic(self.file)
+        if version == (1, 0):
+            (self.shape, self.fortran_order, self.dtype) = np.lib.format.read_array_header_1_0(self.file)
+        else:
+            (self.shape, self.fortran_order, self.dtype) = np.lib.format.read_array_header_2_0(self.file)
+        self.data_offset = self.file.tell()
+
+        self.row_shape = self.shape[1:]
+        self.row_size = int(np.prod(self.row_shape))
+        self.size = int(np.prod(self.shape))
+        if self.fortran_order and self.row_size > 1:  # pragma: no cover
+            raise ValueError(f"Can't read Fortran-ordered rows from {npy_file} with shape {self.shape}.")
+
+    def __getitem__(self, rows: slice) -> np.ndarray:
+        (start, stop, step) = rows.indices(self.shape[0])
+        if step != 1:  # pragma: no cover
+            raise ValueError(f"Can only read contiguous rows from {self.npy_file}, not step {step}.")
+        row_count = max(0, stop - start)
+        self.file.seek(self.data_offset + start * self.row_size * self.dtype.itemsize)
+        data = np.fromfile(self.file, dtype=self.dtype, count=row_count * self.row_size)
+        return data.reshape((row_count, *self.row_shape))
+
+    def close(self) -> None:
+        # Let the OS drop pages we've already read.
+        advise_file(self.file, "POSIX_FADV_DONTNEED")
+        self.file.close()
+
 
 class PhyClusterEventReader(Reader):
     """Read and filter spike/cluster time numeric events from a folder of Phy files."""
@@ -25,8 +134,11 @@ class PhyClusterEventReader(Reader):
         cluster_id_column="cluster_id",
         cluster_filter: str = None,
         result_name: str = "spikes",
-        rows_per_read: int = 2000,
+        rows_per_read: int = 262144,
         csv_dialect: str = 'excel',
+        use_memmap: bool = True,
+        event_buffer_count: int = 3,
+        index_kept_rows: bool = False,
         **csv_fmtparams
     ) -> None:
         """Create a new PhyClusterEventReader.
@@ -55,10 +167,26 @@ class PhyClusterEventReader(Reader):
             result_name:            Name of the Pyramid reader results (and default buffer name) to use.
                                     Default is "spikes".
             rows_per_read:          How many rows of spike_times_name and spike_clusters_name to read per call to read_next().
-                                    This reader will read spike and cluster files incrementally to limit memory usage.
-                                    Default is 2000 rows.
+                                    This reader will read spike and cluster files incrementally to limit memory usage,
+                                    which is roughly rows_per_read * (12 + 16 * event_buffer_count) bytes
+                                    (8 for times, 4 for clusters, 16 for each reusable results buffer).
+                                    Larger reads mean fewer calls to read_next() and long, sequential reads from disk.
+                                    Default is 262144 rows (about 15MB).
             csv_dialect:            Python csv module "dialect" to use when reading cluster CSV/TSV files
                                     Default is "excel".
+            use_memmap:             Whether to memory-map spike_times_name and spike_clusters_name (True),
+                                    or read each increment with ordinary file reads (False).
+                                    Ordinary reads may be faster on network file systems and keep less of the files in memory.
+                                    Default is True, to memory-map the files.
+            event_buffer_count:     How many reusable buffers to rotate through for read_next() results.
+                                    Each result is a view of one of these buffers, so it stays valid
+                                    until event_buffer_count more calls to read_next().
+                                    Default is 3.
+            index_kept_rows:        Whether to scan spike_clusters_name once, on entering the reader, to find rows from
+                                    clusters to keep (True), or to filter each increment as it's read (False).
+                                    When keeping a few clusters out of many, this lets read_next() skip other clusters' rows.
+                                    The index takes 12 bytes per kept spike (8 for the row, 4 for the cluster id).
+                                    Default is False, to filter each increment as it's read.
             **csv_fmtparams         Python csv module "fmtparams" kwargs to use when reading cluster CSV/TSV files
                                     Default is {}.
         """
@@ -70,7 +198,7 @@ class PhyClusterEventReader(Reader):
         self.spike_times_file = Path(phy_folder, spike_times_name)
         self.spike_clusters_file = Path(phy_folder, spike_clusters_name)
 
-        self.custer_files = phy_folder.glob(cluster_glob)
+        self.cluster_files = sorted(phy_folder.glob(cluster_glob))
         self.cluster_delimiters = cluster_delimiters
         self.cluster_id_column = cluster_id_column
         self.cluster_filter = cluster_filter
@@ -80,62 +208,85 @@ class PhyClusterEventReader(Reader):
 
         self.csv_dialect = csv_dialect
         self.csv_fmtparams = csv_fmtparams
+        self.use_memmap = use_memmap
+        self.event_buffer_count = event_buffer_count
+        self.index_kept_rows = index_kept_rows
 
         self.current_row = None
         self.spikes_times = None
         self.spike_clusters = None
         self.sample_rate = None
         self.clusters_to_keep = None
+        self.cluster_keep_mask = None
+        self.event_buffers = None
+        self.event_buffer_index = None
+        self.kept_rows = None
+        self.kept_clusters = None
+        self.kept_row_index = None
+        self.read_increment = None
 
     def __enter__(self) -> Self:
         # Start reading spikes and clusters at the beginning.
         self.current_row = 0
-        self.spikes_times = np.load(self.spike_times_file, mmap_mode="r")
-        self.spike_clusters = np.load(self.spike_clusters_file, mmap_mode="r")
+        if self.use_memmap:
+            self.spikes_times = np.load(self.spike_times_file, mmap_mode="r")
+            self.spike_clusters = np.load(self.spike_clusters_file, mmap_mode="r")
+        else:
+            self.spikes_times = NpyFileReader(self.spike_times_file)
+            self.spike_clusters = NpyFileReader(self.spike_clusters_file)
+
+        # We read spikes and clusters front to back, so let the OS read ahead aggressively.
+        advise_memmap(self.spikes_times, "MADV_SEQUENTIAL")
+        advise_memmap(self.spike_clusters, "MADV_SEQUENTIAL")
+
+        # Rotate through a few buffers for [time, cluster_id] results, instead of allocating new arrays for each read.
+        # These never need to be bigger than the whole file.
+        buffer_rows = min(self.rows_per_read, self.spikes_times.size)
+        self.event_buffers = [np.empty([buffer_rows, 2], dtype=np.float64) for _ in range(self.event_buffer_count)]
+        self.event_buffer_index = 0
 
         # Parse the spike sample rate to convert samples to seconds.
+        # Skip lines that aren't assignments, like comments and blank lines, and stop once we find the sample rate.
         with open(self.params_file, "r") as f:
             for line in f:
-                (name, value) = line.split("=")
-                if name.strip() == self.sample_rate_param_name:
-                    self.sample_rate = float(value.strip())
+                (name, equals, value) = line.partition("=")
+                if equals and name.strip() == self.sample_rate_param_name:
+                    self.sample_rate = float(value.split("#", 1)[0].strip())
+                    break
 
         if self.sample_rate is None:  # pragma: no cover
             raise ValueError(f"Params file {self.params_file} has no entry for {self.sample_rate_param_name}.")
 
         # Parse cluster info files and decide which clusters to keep.
         if self.cluster_filter:
-            # Read in info about each cluster.
-            cluster_info = {}
-            for cluster_file in self.custer_files:
-                # See https://docs.python.org/3/library/csv.html#id3 for why this has newline=''
-                with open(cluster_file, mode='r', newline='') as f:
-                    delimiter = self.cluster_delimiters.get(cluster_file.suffix.lower(), ',')
-                    csv_reader = csv.DictReader(f, delimiter=delimiter, dialect=self.csv_dialect, **self.csv_fmtparams)
-                    for row in csv_reader:
-                        cluster_id = int(row[self.cluster_id_column])
-                        info = cluster_info.get(cluster_id, {})
-
-                        # Convert cluster entries to numbers, when possible.
-                        for name, value in row.items():
-                            try:
-                                info[name] = float(value)
-                            except:
-                                info[name] = value
-
-                        cluster_info[cluster_id] = info
-
-            # Decide which clusters to keep, based on info and given expression.
-            filter_compiled = compile(self.cluster_filter, '<string>', 'eval')
-            self.clusters_to_keep = []
-            for cluster_id, info in cluster_info.items():
-                try:
-                    result = eval(filter_compiled, {}, info)
-                    keep = bool(result)
-                except:
-                    keep = False
-                if keep:
-                    self.clusters_to_keep.append(cluster_id)
+            if pd is not None and self.csv_dialect == 'excel' and not self.csv_fmtparams:
+                # Pandas reads CSV/TSV files in bulk, but doesn't support all the csv module dialects and options.
+                cluster_table = self.read_cluster_table()
+                self.clusters_to_keep = self.filter_cluster_table(cluster_table)
+            else:
+                cluster_info = self.read_cluster_info()
+                self.clusters_to_keep = self.filter_cluster_columns(cluster_info)
+                if self.clusters_to_keep is None:
+                    self.clusters_to_keep = self.filter_cluster_info(cluster_info)
+
+            # Look up whether to keep each spike by its cluster id, rather than searching clusters_to_keep.
+            # The extra False at the end catches any cluster ids beyond those we're keeping.
+            mask_size = max(self.clusters_to_keep, default=-1) + 2
+            self.cluster_keep_mask = np.zeros([mask_size], dtype=np.bool_)
+            self.cluster_keep_mask[self.clusters_to_keep] = True
+
+            if self.index_kept_rows:
+                self.index_rows_to_keep()
+
+        # Choose how to read spikes once, here, instead of checking on each read_next().
+        if self.clusters_to_keep is None:
+            self.read_increment = self.read_next_all_clusters
+        elif self.kept_rows is not None:
+            self.read_increment = self.read_next_kept_rows
+        elif njit is not None:
+            self.read_increment = self.read_next_compiled
+        else:
+            self.read_increment = self.read_next_selected_clusters
 
         return self
 
@@ -145,39 +296,256 @@ class PhyClusterEventReader(Reader):
         __exc_value: BaseException | None,
         __traceback: TracebackType | None
     ) -> bool | None:
+        # Let the OS drop pages we've already read, instead of waiting for the memory maps to be garbage collected.
+        advise_memmap(self.spikes_times, "MADV_DONTNEED")
+        advise_memmap(self.spike_clusters, "MADV_DONTNEED")
+        if isinstance(self.spikes_times, NpyFileReader):
+            self.spikes_times.close()
+        if isinstance(self.spike_clusters, NpyFileReader):
+            self.spike_clusters.close()
         self.spikes_times = None
         self.spike_clusters = None
+        self.event_buffers = None
+        self.kept_rows = None
+        self.kept_clusters = None
+
+    def read_cluster_info(self) -> dict[int, dict[str, Any]]:
+        """Read in info about each cluster, using the Python csv module."""
+        cluster_info = {}
+        for cluster_file in self.cluster_files:
+            # See https://docs.python.org/3/library/csv.html#id3 for why this has newline=''
+            with open(cluster_file, mode='r', newline='') as f:
+                delimiter = self.cluster_delimiters.get(cluster_file.suffix.lower(), ',')
+                csv_reader = csv.DictReader(f, delimiter=delimiter, dialect=self.csv_dialect, **self.csv_fmtparams)
+                for row in csv_reader:
+                    cluster_id = int(row[self.cluster_id_column])
+                    info = cluster_info.get(cluster_id, {})
+
+                    # Convert cluster entries to numbers, when possible.
+                    for name, value in row.items():
+                        try:
+                            info[name] = float(value)
+                        except (ValueError, TypeError):
+                            info[name] = value
+
+                    cluster_info[cluster_id] = info
+        return cluster_info
+
+    def compile_cluster_filter(self) -> tuple[CodeType, set[str]]:
+        """Compile the cluster_filter expression and find the names it refers to, like column names."""
+        filter_compiled = compile(self.cluster_filter, '<string>', 'eval')
+        return (filter_compiled, set(filter_compiled.co_names))
+
+    def filter_cluster_info(self, cluster_info: dict[int, dict[str, Any]]) -> list[int]:
+        """Decide which clusters to keep, based on info and the cluster_filter expression, one cluster at a time."""
+        (filter_compiled, filter_names) = self.compile_cluster_filter()
+        clusters_to_keep = []
+        for cluster_id, info in cluster_info.items():
+            # Only pass in the columns the filter expression refers to.
+            filter_locals = {name: info[name] for name in filter_names if name in info}
+            try:
+                result = eval(filter_compiled, {}, filter_locals)
+                keep = bool(result)
+            except filter_errors:
+                # For example, the filter uses a column this cluster doesn't have, or compares strings to numbers.
+                keep = False
+            if keep:
+                clusters_to_keep.append(cluster_id)
+        return clusters_to_keep
+
+    def filter_cluster_columns(self, cluster_info: dict[int, dict[str, Any]]) -> list[int]:
+        """Decide which clusters to keep all at once, using numexpr with numeric columns, or return None if we can't."""
+        if numexpr is None or not cluster_info:
+            return None
+
+        # Gather the columns the filter refers to -- numexpr can't handle strings mixed with numbers, or gaps.
+        (_, filter_names) = self.compile_cluster_filter()
+        cluster_ids = list(cluster_info.keys())
+        columns = {}
+        for name in filter_names.intersection(cluster_info[cluster_ids[0]].keys()):
+            values = [info.get(name, None) for info in cluster_info.values()]
+            if not all(isinstance(value, float) for value in values):
+                return None
+            columns[name] = np.array(values, dtype=np.float64)
+
+        try:
+            result = numexpr.evaluate(self.cluster_filter, local_dict=columns, global_dict={})
+        except Exception:
+            # For example, the filter uses strings or names that aren't numeric columns.
+            return None
+
+        if result.dtype != np.bool_:
+            return None
+
+        keep = np.broadcast_to(result, [len(cluster_ids)])
+        return [cluster_id for cluster_id, keep_cluster in zip(cluster_ids, keep) if keep_cluster]
+
+    def read_cluster_table(self) -> "pd.DataFrame":
+        """Read in info about all clusters as one table, using pandas, indexed by cluster id."""
+        # Parse files concurrently, since pandas releases the GIL while parsing.
+        if self.cluster_files:
+            with ThreadPoolExecutor(max_workers=min(8, len(self.cluster_files))) as executor:
+                file_tables = list(executor.map(self.read_cluster_file_table, self.cluster_files))
+        else:
+            file_tables = []
+
+        cluster_table = None
+        for file_table in file_tables:
+            if cluster_table is None:
+                cluster_table = file_table
+            else:
+                # As with the csv module, when files have the same columns, later files take precedence.
+                cluster_table = file_table.combine_first(cluster_table)
+
+        if cluster_table is None:
+            cluster_table = pd.DataFrame(index=pd.Index([], name=self.cluster_id_column))
+        return cluster_table
+
+    def read_cluster_file_table(self, cluster_file: Path) -> "pd.DataFrame":
+        """Read in info about all clusters from one file, using pandas, indexed by cluster id."""
+        delimiter = self.cluster_delimiters.get(cluster_file.suffix.lower(), ',')
+        return pd.read_csv(cluster_file, sep=delimiter, engine='c').set_index(self.cluster_id_column)
+
+    def filter_cluster_table(self, cluster_table: "pd.DataFrame") -> list[int]:
+        """Decide which clusters to keep, based on info and the cluster_filter expression, all at once when possible."""
+        try:
+            result = cluster_table.eval(self.cluster_filter)
+        except Exception:
+            result = None
+
+        if isinstance(result, bool):
+            # A constant expression like "True" or "False" applies to all clusters.
+            keep = np.repeat(result, cluster_table.shape[0])
+        elif isinstance(result, pd.Series) and result.dtype == np.bool_:
+            keep = result.to_numpy()
+        else:
+            # Let Python evaluate what pandas can't, cluster by cluster, as with the csv module.
+            logging.info(f"Evaluating cluster_filter one cluster at a time: {self.cluster_filter}")
+            rows = cluster_table.reset_index().set_index(self.cluster_id_column, drop=False)
+            cluster_info = rows.to_dict(orient='index')
+            return [int(cluster_id) for cluster_id in self.filter_cluster_info(cluster_info)]
+
+        return [int(cluster_id) for cluster_id in cluster_table.index[keep]]
+
+    def index_rows_to_keep(self) -> None:
+        """Scan all cluster ids once to find rows from clusters to keep, along with their cluster ids."""
+        kept_rows = []
+        kept_clusters = []
+        for start_row in range(0, self.spike_clusters.shape[0], self.rows_per_read):
+            clusters = self.spike_clusters[start_row:start_row + self.rows_per_read].ravel()
+            selected_rows = np.flatnonzero(self.select_clusters(clusters))
+            kept_rows.append(selected_rows + start_row)
+            kept_clusters.append(clusters.take(selected_rows))
+        if kept_rows:
+            self.kept_rows = np.concatenate(kept_rows)
+            self.kept_clusters = np.concatenate(kept_clusters)
+        else:
+            self.kept_rows = np.empty([0], dtype=np.intp)
+            self.kept_clusters = np.empty([0], dtype=self.spike_clusters.dtype)
+        self.kept_row_index = 0
 
     def read_next(self) -> dict[str, BufferData]:
         if self.current_row >= self.spikes_times.size:
             # Reached the end of the spikes, all done.
             raise StopIteration
 
-        # Read the next increment of spike times and corresponding cluster ids.
+        return self.read_increment()
+
+    def read_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """Read the next increment of spike times and corresponding cluster ids."""
+        # Phy might save these as 1D arrays or as 2D arrays with one column, so ravel() them to 1D.
         until_row = min(self.spikes_times.size, self.current_row + self.rows_per_read)
-        times = self.spikes_times[self.current_row:until_row] / self.sample_rate
-        clusters = self.spike_clusters[self.current_row:until_row]
+        times = self.spikes_times[self.current_row:until_row].ravel()
+        clusters = self.spike_clusters[self.current_row:until_row].ravel()
         self.current_row = until_row
+        return (times, clusters)
 
-        if self.clusters_to_keep is None:
-            # Take spikes from all clusters.
-            selected_times = times
-            selected_clusters = clusters
-        else:
-            # Take spikes from select clusters, only.
-            selector = np.in1d(clusters, self.clusters_to_keep)
-            selected_times = times[selector]
-            selected_clusters = clusters[selector]
+    def next_event_buffer(self) -> np.ndarray:
+        """Take the least recently used results buffer."""
+        event_buffer = self.event_buffers[self.event_buffer_index]
+        self.event_buffer_index = (self.event_buffer_index + 1) % len(self.event_buffers)
+        return event_buffer
 
+    def pack_events(self, selected_times: np.ndarray, selected_clusters: np.ndarray) -> dict[str, BufferData]:
+        """Convert selected spikes to [time, cluster_id] results, or None if there are none."""
         if selected_times.size > 0:
-            # [time, cluster_id]
-            event_data = np.concatenate([selected_times, selected_clusters], axis=1)
+            # Fill a reusable event buffer and return a view of it.
+            # This is valid for the next event_buffer_count - 1 calls to read_next(), and ReaderRouter copies results sooner.
+            event_data = self.next_event_buffer()[:selected_times.size]
+            np.divide(selected_times, self.sample_rate, out=event_data[:, 0])
+            event_data[:, 1] = selected_clusters
             return {
                 self.result_name: NumericEventList(event_data)
             }
         else:
             return None
 
+    def read_next_all_clusters(self) -> dict[str, BufferData]:
+        """Read the next increment of spikes from all clusters."""
+        (times, clusters) = self.read_rows()
+        return self.pack_events(times, clusters)
+
+    def read_next_selected_clusters(self) -> dict[str, BufferData]:
+        """Read the next increment of spikes and take those from clusters to keep, using NumPy."""
+        (times, clusters) = self.read_rows()
+
+        # Find selected rows once, then gather times and clusters from the same row indices.
+        selected_rows = np.flatnonzero(self.select_clusters(clusters))
+        return self.pack_events(times.take(selected_rows), clusters.take(selected_rows))
+
+    def read_next_compiled(self) -> dict[str, BufferData]:
+        """Read the next increment of spikes and take those from clusters to keep, using the numba kernel."""
+        (times, clusters) = self.read_rows()
+
+        # Filter, scale, and pack spikes in one compiled pass.
+        event_buffer = self.next_event_buffer()
+        count = pack_spike_events(times, clusters, self.cluster_keep_mask, self.sample_rate, event_buffer)
+        if count > 0:
+            return {
+                self.result_name: NumericEventList(event_buffer[:count])
+            }
+        else:
+            return None
+
+    def read_next_kept_rows(self) -> dict[str, BufferData]:
+        """Read the next increment of spikes from clusters to keep, using rows found by index_rows_to_keep()."""
+        start_index = self.kept_row_index
+        until_index = min(self.kept_rows.size, start_index + self.rows_per_read)
+        if isinstance(self.spikes_times, NpyFileReader) and start_index < until_index:
+            # We'll read the whole span from the first to the last kept row, so limit the span to rows_per_read rows.
+            span_end_row = self.kept_rows[start_index] + self.rows_per_read
+            until_index = min(until_index, int(np.searchsorted(self.kept_rows, span_end_row)))
+        rows = self.kept_rows[start_index:until_index]
+        self.kept_row_index = until_index
+        if until_index < self.kept_rows.size:
+            self.current_row = int(rows[-1]) + 1
+        else:
+            self.current_row = self.spikes_times.size
+
+        if rows.size == 0:
+            return None
+
+        if isinstance(self.spikes_times, NpyFileReader):
+            # Read the span of rows with ordinary file reads, then pick out the kept ones.
+            span_times = self.spikes_times[rows[0]:rows[-1] + 1].ravel()
+            selected_times = span_times.take(rows - rows[0])
+        else:
+            # Let the memory map page in just the kept rows.
+            selected_times = self.spikes_times.reshape(-1)[rows]
+
+        return self.pack_events(selected_times, self.kept_clusters[start_index:until_index])
+
+    def select_clusters(self, clusters: np.ndarray) -> np.ndarray:
+        """Make a boolean selector for spikes whose cluster ids are in clusters_to_keep."""
+        if 0 < len(self.clusters_to_keep) <= max_clusters_to_compare:
+            # For a few clusters, comparing ids directly is faster than looking them up in cluster_keep_mask.
+            selector = clusters == self.clusters_to_keep[0]
+            for cluster_id in self.clusters_to_keep[1:]:
+                selector |= clusters == cluster_id
+            return selector
+        else:
+            return self.cluster_keep_mask.take(clusters, mode='clip')
+
     def get_initial(self) -> dict[str, BufferData]:
         return {
             # [time, cluster_id]
@@ -1,4 +1,7 @@
 import logging
+import mmap
+import os
+import struct
 from types import TracebackType
 from typing import ContextManager, Self, Any
 from pathlib import Path
@@ -11,6 +14,12 @@ from pyramid.model.events import NumericEventList
 from pyramid.model.signals import SignalChunk
 from pyramid.neutral_zone.readers.readers import Reader
 
+try:
+    # numba is optional, but walks through data block headers much faster than Python.
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
 
 # Representing Plexon file from C headers available here:
 # http://www.plexon.com/software-downloads
@@ -138,6 +147,75 @@ DataBlockHeader = np.dtype(
 )
 
 
+# Each data block header tells us the size of the waveform payload that follows it, in 2-byte words.
+block_header_size = DataBlockHeader.itemsize
+waveform_size_struct = struct.Struct("<HH")
+waveform_size_offset = DataBlockHeader.fields['NumberOfWaveforms'][1]
+
+
+def find_block_offsets(file_bytes: np.ndarray, data_offset: int) -> np.ndarray:
+    """Walk from block header to block header in file_bytes, skipping waveform payloads, to find where each block starts."""
+    file_size = file_bytes.size
+
+    # Count the blocks first so we can allocate offsets once.
+    block_count = 0
+    offset = data_offset
+    while offset + block_header_size <= file_size:
+        block_count += 1
+        offset += block_header_size + 2 * waveform_words_at(file_bytes, offset)
+
+    # Walk again to record each block's offset.
+    offsets = np.empty(block_count, dtype=np.int64)
+    offset = data_offset
+    for index in range(block_count):
+        offsets[index] = offset
+        offset += block_header_size + 2 * waveform_words_at(file_bytes, offset)
+    return offsets
+
+
+def waveform_words_at(file_bytes: np.ndarray, offset: int) -> int:
+    """Read the NumberOfWaveforms and NumberOfWordsInWaveform of the block header at offset, and multiply them."""
+    size_at = offset + waveform_size_offset
+    n = np.int64(file_bytes[size_at]) | (np.int64(file_bytes[size_at + 1]) << 8)
+    m = np.int64(file_bytes[size_at + 2]) | (np.int64(file_bytes[size_at + 3]) << 8)
+    return n * m
+
+
+def copy_block_headers(file_bytes: np.ndarray, offsets: np.ndarray, header_bytes: np.ndarray) -> None:
+    """Copy the block header at each offset in file_bytes into the corresponding row of header_bytes."""
+    for index in range(offsets.size):
+        offset = offsets[index]
+        for byte_index in range(block_header_size):
+            header_bytes[index, byte_index] = file_bytes[offset + byte_index]
+
+
+if njit is not None:
+    waveform_words_at = njit(cache=True)(waveform_words_at)
+    find_block_offsets = njit(cache=True)(find_block_offsets)
+    copy_block_headers = njit(cache=True)(copy_block_headers)
+
+
+def combine_timestamps(upper_bytes: np.ndarray, lower_words: np.ndarray) -> np.ndarray:
+    """Combine the upper byte and lower 4 bytes of 5-byte block timestamps into int64 clock ticks.
+
+    The lower 4 bytes are declared as a signed int32, but hold the unsigned low bits of the timestamp.
+    """
+    return (upper_bytes.astype(np.int64) << 32) | lower_words.astype(np.uint32).astype(np.int64)
+
+
+# How many blocks to read between telling the OS it can drop file pages we've already read.
+blocks_per_page_release = 4096
+
+# Names for the values of each block, as returned from PlexonPlxRawReader.next_block_values().
+block_value_names = ("type", "file_offset", "timestamp", "timestamp_seconds", "channel", "unit", "frequency", "waveforms")
+
+# PlexonPlxReader reads fewer blocks than this one at a time, and more blocks in batches per channel.
+min_batch_blocks = 16
+
+# How many block headers to gather at once without numba, to limit memory used for temporary gather indexes.
+blocks_per_header_gather = 65536
+
+
 class PlexonPlxRawReader(ContextManager):
     """Read a Pleoxn .plx file sequentially, block by block.
 
@@ -151,52 +229,77 @@ class PlexonPlxRawReader(ContextManager):
     Thanks to the neo author Samuel Garcia for implementing a .plx file model in pure Python!
     """
 
-    def __init__(self, plx_file: str) -> None:
+    def __init__(self, plx_file: str, scale_waveforms: bool = True, headers_only: bool = False) -> None:
         self.plx_file = plx_file
 
+        # Whether to scale waveforms by channel gain, or leave that to the caller and return raw int16 ADC values.
+        self.scale_waveforms = scale_waveforms
+
+        # Whether to read only the file and channel headers, and skip indexing data blocks.
+        self.headers_only = headers_only
+
         self.plx_stream = None
+        self.plx_map = None
+        self.plx_bytes = None
+        self.released_offset = 0
         self.block_count = 0
+        self.block_offsets = None
+        self.block_headers = None
+        self.block_timestamps = None
+        self.block_timestamps_seconds = None
         self.global_header = None
 
+        self.dsp_channel_header_array = None
         self.dsp_channel_headers = None
         self.gain_per_dsp_channel = None
         self.dsp_frequency = None
         self.timestamp_frequency = None
 
+        self.event_channel_header_array = None
         self.event_channel_headers = None
 
+        self.slow_channel_header_array = None
         self.slow_channel_headers = None
         self.gain_per_slow_channel = None
         self.frequency_per_slow_channel = None
 
+        # Look up how to handle each block by type, instead of checking each type in turn.
+        self.block_handlers = {
+            4: self.block_event_data,
+            1: self.block_dsp_data,
+            5: self.block_slow_data,
+        }
+
     def __enter__(self) -> Self:
         self.plx_stream = open(self.plx_file, 'br')
+        if hasattr(os, "posix_fadvise"):
+            # We read the file front to back, so let the OS read ahead aggressively.
+            os.posix_fadvise(self.plx_stream.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
 
         self.global_header = self.consume_type_as_dict(GlobalHeader)
 
+        # Read each kind of channel header as one structured array, and also as friendly dicts.
         # DSP aka "spike" aka "waveform" channel configuration.
-        self.dsp_channel_headers = [
-            self.consume_type_as_dict(DspChannelHeader)
-            for _ in range(self.global_header["NumDSPChannels"])
-        ]
+        self.dsp_channel_header_array = self.consume_type_array(DspChannelHeader, self.global_header["NumDSPChannels"])
+        self.dsp_channel_headers = [self.item_as_dict(item) for item in self.dsp_channel_header_array]
         self.gain_per_dsp_channel = self.get_gain_per_dsp_channel()
         self.dsp_frequency = self.global_header["WaveformFreq"]
         self.timestamp_frequency = self.global_header["ADFrequency"]
 
         # Event channel configuration.
-        self.event_channel_headers = [
-            self.consume_type_as_dict(EventChannelHeader)
-            for _ in range(self.global_header["NumEventChannels"])
-        ]
+        self.event_channel_header_array = self.consume_type_array(EventChannelHeader, self.global_header["NumEventChannels"])
+        self.event_channel_headers = [self.item_as_dict(item) for item in self.event_channel_header_array]
 
         # Slow, aka "ad", aka "analog" channel configuration.
-        self.slow_channel_headers = [
-            self.consume_type_as_dict(SlowChannelHeader)
-            for _ in range(self.global_header["NumSlowChannels"])
-        ]
+        self.slow_channel_header_array = self.consume_type_array(SlowChannelHeader, self.global_header["NumSlowChannels"])
+        self.slow_channel_headers = [self.item_as_dict(item) for item in self.slow_channel_header_array]
         self.gain_per_slow_channel = self.get_gain_per_slow_channel()
         self.frequency_per_slow_channel = self.get_frequency_per_slow_channel()
 
+        # Data blocks follow the headers -- find them all now so we can move through them without small reads.
+        if not self.headers_only:
+            self.index_blocks(self.plx_stream.tell())
+
         return self
 
     def __exit__(
@@ -205,6 +308,14 @@ class PlexonPlxRawReader(ContextManager):
         __exc_value: BaseException | None,
         __traceback: TracebackType | None
     ) -> bool | None:
+        self.plx_bytes = None
+        if self.plx_map:
+            try:
+                self.plx_map.close()
+            except BufferError:
+                # Waveforms from the file still refer to the memory map, so let garbage collection close it later.
+                pass
+        self.plx_map = None
         if self.plx_stream:
             self.plx_stream.close()
         self.plx_stream = None
@@ -221,152 +332,236 @@ class PlexonPlxRawReader(ContextManager):
         item = self.consume_type(dtype)
         if item is None:  # pragma: no cover
             return None
+        return self.item_as_dict(item)
+
+    def consume_type_array(self, dtype: np.dtype, count: int) -> np.ndarray:
+        """Consume count consecutive items from the file with one read, as a structured array of the given dtype."""
+        bytes = self.plx_stream.read(dtype.itemsize * count)
+        return np.frombuffer(bytes, dtype, count=count)
 
+    def item_as_dict(self, item: np.void) -> dict[str, Any]:
+        """Convert one structured array item to a friendly dict, with strings decoded."""
         result = {}
-        for name in dtype.names:
+        for name in item.dtype.names:
             value = item[name]
-            if dtype[name].kind == 'S':
+            if item.dtype[name].kind == 'S':
                 value = value.decode('utf8')
                 value = value.replace('\x03', '')
                 value = value.replace('\x00', '')
             result[name] = value
         return result
 
-    def get_gain_per_slow_channel(self) -> dict[int, float]:
-        """Compute ad channel gain -- thanks to python-neo and Samuel Garcia!"""
-        gains = {}
-        for header in self.slow_channel_headers:
-            # We don't currently have test files at versions < 103
-            if self.global_header['Version'] in [100, 101]:  # pragma: no cover
-                gain = 5000. / (2048 * header['Gain'] * 1000.)
-            elif self.global_header['Version'] in [102]:  # pragma: no cover
-                gain = 5000. / (2048 * header['Gain'] * header['PreampGain'])
-            elif self.global_header['Version'] >= 103:
-                gain = self.global_header['SlowMaxMagnitudeMV'] / (
-                    .5 * (2 ** self.global_header['BitsPerSlowSample']) *
-                    header['Gain'] * header['PreampGain'])
-            gains[header['Channel']] = gain
+    def get_gain_per_slow_channel(self) -> np.ndarray:
+        """Compute ad channel gain -- thanks to python-neo and Samuel Garcia!
+
+        Returns an array of gains indexed by channel id, with nan for ids that aren't slow channels.
+        """
+        headers = self.slow_channel_header_array
+        # We don't currently have test files at versions < 103
+        if self.global_header['Version'] in [100, 101]:  # pragma: no cover
+            channel_gains = 5000. / (2048 * headers['Gain'] * 1000.)
+        elif self.global_header['Version'] in [102]:  # pragma: no cover
+            channel_gains = 5000. / (2048 * headers['Gain'] * headers['PreampGain'])
+        elif self.global_header['Version'] >= 103:
+            channel_gains = self.global_header['SlowMaxMagnitudeMV'] / (
+                .5 * (2 ** self.global_header['BitsPerSlowSample']) *
+                headers['Gain'] * headers['PreampGain'])
+        gains = self.channel_lookup_table(headers)
+        gains[headers['Channel']] = channel_gains
         return gains
 
+    def channel_lookup_table(self, channel_headers: np.ndarray) -> np.ndarray:
+        """Make an array with one element per channel id, up to the highest id in channel_headers, filled with nan."""
+        max_channel = channel_headers['Channel'].max(initial=-1)
+        return np.full(max_channel + 1, np.nan, dtype=np.float64)
+
     def get_frequency_per_slow_channel(self) -> dict[int, float]:
         frequencies = {}
         for header in self.slow_channel_headers:
             frequencies[header['Channel']] = header['ADFreq']
         return frequencies
 
-    def get_gain_per_dsp_channel(self) -> dict[int, float]:
-        """Compute spike channel gain -- thanks to python-neo and Samuel Garcia!"""
-        gains = {}
-        for header in self.dsp_channel_headers:
-            # We don't currently have test files at versions < 103
-            if self.global_header['Version'] < 103:  # pragma: no cover
-                gain = 3000. / (2048 * header['Gain'] * 1000.)
-            elif 103 <= self.global_header['Version'] < 105:  # pragma: no cover
-                gain = self.global_header['SpikeMaxMagnitudeMV'] / (
-                    .5 * 2. ** (self.global_header['BitsPerSpikeSample']) *
-                    header['Gain'] * 1000.)
-            elif self.global_header['Version'] >= 105:
-                gain = self.global_header['SpikeMaxMagnitudeMV'] / (
-                    .5 * 2. ** (self.global_header['BitsPerSpikeSample']) *
-                    header['Gain'] * self.global_header['SpikePreAmpGain'])
-            gains[header['Channel']] = gain
+    def get_gain_per_dsp_channel(self) -> np.ndarray:
+        """Compute spike channel gain -- thanks to python-neo and Samuel Garcia!
+
+        Returns an array of gains indexed by channel id, with nan for ids that aren't spike channels.
+        """
+        headers = self.dsp_channel_header_array
+        # We don't currently have test files at versions < 103
+        if self.global_header['Version'] < 103:  # pragma: no cover
+            channel_gains = 3000. / (2048 * headers['Gain'] * 1000.)
+        elif 103 <= self.global_header['Version'] < 105:  # pragma: no cover
+            channel_gains = self.global_header['SpikeMaxMagnitudeMV'] / (
+                .5 * 2. ** (self.global_header['BitsPerSpikeSample']) *
+                headers['Gain'] * 1000.)
+        elif self.global_header['Version'] >= 105:
+            channel_gains = self.global_header['SpikeMaxMagnitudeMV'] / (
+                .5 * 2. ** (self.global_header['BitsPerSpikeSample']) *
+                headers['Gain'] * self.global_header['SpikePreAmpGain'])
+        gains = self.channel_lookup_table(headers)
+        gains[headers['Channel']] = channel_gains
         return gains
 
+    def index_blocks(self, data_offset: int) -> None:
+        """Scan the data blocks once, starting at data_offset, to find each block's file offset and header fields."""
+        self.plx_map = mmap.mmap(self.plx_stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self.plx_map.madvise(mmap.MADV_SEQUENTIAL)
+        self.released_offset = 0
+        self.plx_bytes = np.frombuffer(self.plx_map, dtype=np.uint8)
+
+        # Walk from header to header, skipping waveform payloads, to find where each block starts.
+        if njit is not None:
+            self.block_offsets = find_block_offsets(self.plx_bytes, data_offset)
+        else:
+            self.block_offsets = self.find_block_offsets(data_offset)
+
+        # Gather all the block headers into a structured array with one column per header field.
+        # Keep the byte array view of the whole file, so we can also take waveforms from it without copying.
+        self.block_headers = np.empty(self.block_offsets.size, dtype=DataBlockHeader)
+        header_bytes = self.block_headers.view(np.uint8).reshape([-1, block_header_size])
+        if njit is not None:
+            copy_block_headers(self.plx_bytes, self.block_offsets, header_bytes)
+        else:
+            self.copy_block_headers(header_bytes)
+
+        # Convert all block timestamps from 5-byte clock ticks to seconds at once.
+        self.block_timestamps = combine_timestamps(
+            self.block_headers['UpperByteOf5ByteTimestamp'],
+            self.block_headers['TimeStamp']
+        )
+        self.block_timestamps_seconds = self.block_timestamps / self.timestamp_frequency
+
+    def find_block_offsets(self, data_offset: int) -> np.ndarray:
+        """Walk from block header to block header in Python, when numba isn't available."""
+        file_size = len(self.plx_map)
+        unpack_from = waveform_size_struct.unpack_from
+        offsets = []
+        offset = data_offset
+        while offset + block_header_size <= file_size:
+            offsets.append(offset)
+            (n, m) = unpack_from(self.plx_map, offset + waveform_size_offset)
+            offset += block_header_size + 2 * n * m
+        return np.array(offsets, dtype=np.int64)
+
+    def copy_block_headers(self, header_bytes: np.ndarray) -> None:
+        """Gather block headers with numpy indexing, in bounded batches, when numba isn't available."""
+        header_range = np.arange(block_header_size)
+        for start in range(0, self.block_offsets.size, blocks_per_header_gather):
+            offsets = self.block_offsets[start:start + blocks_per_header_gather]
+            header_bytes[start:start + offsets.size] = self.plx_bytes[offsets[:, np.newaxis] + header_range]
+
     #@profile
     def next_block(self) -> dict[str, Any]:
         """Consume the next block header and any waveform data, as a friendly dict."""
-        block_header = self.consume_type(DataBlockHeader)
-        if not block_header:
+        block = self.next_block_values()
+        if block is None:
+            return None
+        return {name: value for name, value in zip(block_value_names, block) if value is not None}
+
+    #@profile
+    def next_block_values(self) -> tuple:
+        """Consume the next block header and any waveform data, as a tuple of values ordered like block_value_names.
+
+        This avoids creating a dict per block.  Event blocks have None for frequency and waveforms.
+        """
+        if self.block_count >= self.block_offsets.size:
             return None
 
+        index = self.block_count
+        if index % blocks_per_page_release == 0:
+            self.release_pages_before(self.block_offsets.item(index))
+
+        (block_type, _, _, channel, unit, n, m) = self.block_headers.item(index)
+        file_offset = self.block_offsets.item(index) + block_header_size
+        timestamp = self.block_timestamps.item(index)
+        timestamp_seconds = self.block_timestamps_seconds.item(index)
         self.block_count += 1
 
-        file_offset = self.plx_stream.tell()
-        timestamp = int(block_header['UpperByteOf5ByteTimestamp']) * 2 ** 32 + int(block_header['TimeStamp'])
-        block_type = block_header['Type']
-        if block_type == 4:
-            # An event value with no waveform payload.
-            return self.block_event_data(block_header, block_type, timestamp, file_offset)
-        elif block_type == 1:
-            # A spike event with a waveform payload.
-            return self.block_dsp_data(block_header, block_type, timestamp, file_offset)
-        elif block_type == 5:
-            # A slow channel update with a waveform payload.
-            return self.block_slow_data(block_header, block_type, timestamp, file_offset)
-        else:  # pragma: no cover
-            logging.warning(f"Skipping block of unknown type {block_type}.  Block header is: {block_header}")
+        block_handler = self.block_handlers.get(block_type, None)
+        if block_handler is None:  # pragma: no cover
+            logging.warning(f"Skipping block of unknown type {block_type}.  Block offset is: {file_offset}")
             return None
+        return block_handler(block_type, file_offset, timestamp, timestamp_seconds, channel, unit, n, m)
+
+    def skip_blocks(self, count: int) -> None:
+        """Move past the next count blocks without reading their waveforms or creating any values."""
+        index = self.block_count
+        self.block_count += count
+
+        # Release pages as if we'd read these blocks one at a time with next_block_values().
+        last_index = self.block_count - 1
+        release_index = last_index - last_index % blocks_per_page_release
+        if release_index >= index:
+            self.release_pages_before(self.block_offsets.item(release_index))
+
+    def release_pages_before(self, file_offset: int) -> None:
+        """Let the OS drop memory-mapped pages before file_offset, which we've already read, to limit memory use."""
+        if not hasattr(mmap, "MADV_DONTNEED"):  # pragma: no cover
+            return
+
+        # The file stays mapped and pages read in again if needed, for example if callers still have raw waveforms.
+        release_until = file_offset - file_offset % mmap.PAGESIZE
+        if release_until > self.released_offset:
+            self.plx_map.madvise(mmap.MADV_DONTNEED, self.released_offset, release_until - self.released_offset)
+            self.released_offset = release_until
 
     #@profile
     def block_event_data(
         self,
-        block_header: np.ndarray,
         block_type: int,
-        timestamp: float,
-        file_offset: int
-    ) -> dict[str, Any]:
-        return {
-            "type": block_type,
-            "file_offset": file_offset,
-            "timestamp": timestamp,
-            "timestamp_seconds": timestamp / self.timestamp_frequency,
-            "channel": block_header['Channel'],
-            "unit": block_header['Unit'],
-        }
+        file_offset: int,
+        timestamp: int,
+        timestamp_seconds: float,
+        channel: int,
+        unit: int,
+        n: int,
+        m: int
+    ) -> tuple:
+        """An event value with no waveform payload."""
+        return (block_type, file_offset, timestamp, timestamp_seconds, channel, unit, None, None)
 
     #@profile
-    def consume_block_waveforms(self, block_header: np.ndarray) -> np.ndarray:
-        n = int(block_header["NumberOfWaveforms"])
-        m = int(block_header["NumberOfWordsInWaveform"])
-        bytes = self.plx_stream.read(n * m * 2)
-        waveforms = np.frombuffer(bytes, dtype='int16')
-        waveforms.reshape([n, m])
-        return waveforms
+    def consume_block_waveforms(self, file_offset: int, n: int, m: int) -> np.ndarray:
+        """Get n waveforms of m samples each, flattened to 1D, as a read-only view into the memory-mapped file."""
+        return self.plx_bytes[file_offset:file_offset + n * m * 2].view(np.int16)
 
     #@profile
     def block_dsp_data(
         self,
-        block_header: np.ndarray,
         block_type: int,
-        timestamp: float,
-        file_offset: int
-    ) -> dict[str, Any]:
-        waveforms = self.consume_block_waveforms(block_header)
-        channel = block_header['Channel']
-        gain = self.gain_per_dsp_channel[channel]
-        return {
-            "type": block_type,
-            "file_offset": file_offset,
-            "timestamp": timestamp,
-            "timestamp_seconds": timestamp / self.timestamp_frequency,
-            "channel": channel,
-            "unit": block_header['Unit'],
-            "frequency": self.dsp_frequency,
-            "waveforms": waveforms * gain
-        }
+        file_offset: int,
+        timestamp: int,
+        timestamp_seconds: float,
+        channel: int,
+        unit: int,
+        n: int,
+        m: int
+    ) -> tuple:
+        """A spike event with a waveform payload."""
+        waveforms = self.consume_block_waveforms(file_offset, n, m)
+        if self.scale_waveforms:
+            waveforms = waveforms * self.gain_per_dsp_channel[channel]
+        return (block_type, file_offset, timestamp, timestamp_seconds, channel, unit, self.dsp_frequency, waveforms)
 
     #@profile
     def block_slow_data(
         self,
-        block_header: np.ndarray,
         block_type: int,
-        timestamp: float,
-        file_offset: int
-    ) -> dict[str, Any]:
-        waveforms = self.consume_block_waveforms(block_header)
-        channel = block_header['Channel']
-        gain = self.gain_per_slow_channel[channel]
+        file_offset: int,
+        timestamp: int,
+        timestamp_seconds: float,
+        channel: int,
+        unit: int,
+        n: int,
+        m: int
+    ) -> tuple:
+        """A slow channel update with a waveform payload."""
+        waveforms = self.consume_block_waveforms(file_offset, n, m)
+        if self.scale_waveforms:
+            waveforms = waveforms * self.gain_per_slow_channel[channel]
         channel_frequency = self.frequency_per_slow_channel[channel]
-        return {
-            "type": block_type,
-            "file_offset": file_offset,
-            "timestamp": timestamp,
-            "timestamp_seconds": timestamp / self.timestamp_frequency,
-            "channel": channel,
-            "unit": block_header['Unit'],
-            "frequency": channel_frequency,
-            "waveforms": waveforms * gain
-        }
+        return (block_type, file_offset, timestamp, timestamp_seconds, channel, unit, channel_frequency, waveforms)
 
 
 class PlexonPlxReader(Reader):
@@ -416,10 +611,26 @@ class PlexonPlxReader(Reader):
         self.events_prefix = events_prefix
         self.signals_prefix = signals_prefix
 
-        self.raw_reader = PlexonPlxRawReader(self.plx_file)
+        # Read raw waveforms and scale signal chunks by gain once per read_next(), rather than once per block.
+        self.raw_reader = PlexonPlxRawReader(self.plx_file, scale_waveforms=False)
         self.spike_channel_names = None
         self.event_channel_names = None
         self.signal_channel_names = None
+        self.kept_names = None
+        self.block_name_ids = None
+        self.block_end_times = None
+
+        # Look up how to handle each block, or batch of blocks, by type, instead of checking each type in turn.
+        self.block_handlers = {
+            1: self.block_spike_event,
+            4: self.block_event,
+            5: self.block_signal_chunk,
+        }
+        self.block_batch_handlers = {
+            1: self.batch_spike_events,
+            4: self.batch_events,
+            5: self.batch_signal_chunk,
+        }
 
     def __enter__(self) -> Any:
         self.raw_reader.__enter__()
@@ -442,8 +653,54 @@ class PlexonPlxReader(Reader):
             self.signals_prefix
         )
 
+        self.name_blocks()
+        self.block_end_times = self.get_block_end_times()
+
         return self
 
+    def name_blocks(self) -> None:
+        """Look up the channel name for every indexed block at once, or "skip" for channels we're not keeping.
+
+        This sets block_name_ids, with an index into kept_names for each block.
+        """
+        all_names = [*self.spike_channel_names.values(), *self.event_channel_names.values(), *self.signal_channel_names.values()]
+        self.kept_names = ["skip", *dict.fromkeys(all_names)]
+        ids_by_name = {name: name_id for name_id, name in enumerate(self.kept_names)}
+
+        block_types = self.raw_reader.block_headers["Type"]
+        block_channels = self.raw_reader.block_headers["Channel"]
+        self.block_name_ids = np.zeros(block_types.size, dtype=np.intp)
+        names_by_type = {
+            1: self.spike_channel_names,
+            4: self.event_channel_names,
+            5: self.signal_channel_names,
+        }
+        for block_type, names_by_id in names_by_type.items():
+            # Index name ids directly by channel id, with 0 for "skip" for channels not in names_by_id.
+            max_channel = max([*names_by_id.keys(), block_channels.max(initial=0)])
+            name_id_lut = np.zeros(max_channel + 1, dtype=np.intp)
+            for channel_id, name in names_by_id.items():
+                name_id_lut[channel_id] = ids_by_name[name]
+            is_type = block_types == block_type
+            self.block_name_ids[is_type] = name_id_lut[block_channels[is_type]]
+
+    def get_block_end_times(self) -> np.ndarray:
+        """Compute the end time of every indexed block at once, the same as get_end_time() for the block's data."""
+        block_headers = self.raw_reader.block_headers
+        block_end_times = self.raw_reader.block_timestamps_seconds.copy()
+
+        # Slow blocks have signal chunks that end with their last sample, or nan for empty chunks.
+        is_slow = block_headers["Type"] == 5
+        max_channel = max([*self.raw_reader.frequency_per_slow_channel.keys(), block_headers["Channel"].max(initial=0)])
+        frequency_lut = np.full(max_channel + 1, np.nan, dtype=np.float64)
+        for channel_id, frequency in self.raw_reader.frequency_per_slow_channel.items():
+            frequency_lut[channel_id] = frequency
+        sample_counts = block_headers["NumberOfWaveforms"][is_slow].astype(np.int64) * block_headers["NumberOfWordsInWaveform"][is_slow]
+        durations = (sample_counts - 1) / frequency_lut[block_headers["Channel"][is_slow]]
+        durations[sample_counts == 0] = np.nan
+        block_end_times[is_slow] += durations
+        return block_end_times
+
     def choose_channel_names(
         self,
         channel_headers: list[dict[str, Any]],
@@ -471,77 +728,155 @@ class PlexonPlxReader(Reader):
 
     #@profile
     def read_next(self) -> dict[str, BufferData]:
-        (name, data) = self.read_one_block()
-        if name is None:
+        start = self.raw_reader.block_count
+        if start >= self.block_end_times.size:
             # If there's nothing at all to read, the .plx file is done.
             raise StopIteration
 
         # Otherwise, return at least some results.
+        stop = self.find_read_stop(start)
+        if stop - start < min_batch_blocks:
+            # Numpy overhead would outweigh batching for just a few blocks.
+            return self.read_blocks_one_at_a_time(start, stop)
+
+        # Read a batch of blocks for each kept channel.
+        window_name_ids = self.block_name_ids[start:stop]
         results = {}
-        if name != "skip":
-            results[name] = data
-        first_data_time = data.get_end_time()
-        while name is not None and data.get_end_time() - first_data_time < self.seconds_per_read:
-            (name, data) = self.read_one_block()
-            if name == "skip":
+        for name_id in np.unique(window_name_ids):
+            if name_id == 0:
                 continue
-            elif name in results:
-                results[name].append(data)
-            else:
-                results[name] = data
+            block_indexes = start + np.flatnonzero(window_name_ids == name_id)
+            name = self.kept_names[name_id]
+            block_type = self.raw_reader.block_headers["Type"].item(block_indexes[0])
+            results[name] = self.block_batch_handlers[block_type](block_indexes)
 
+        self.raw_reader.skip_blocks(stop - start)
         return results
 
+    def find_read_stop(self, start: int) -> int:
+        """Find the index just past the first block that ends seconds_per_read or more after the block at start.
+
+        This matches reading one block at a time until the data span seconds_per_read.
+        Search in growing windows so we don't compare the rest of the file each time.
+        """
+        if self.seconds_per_read <= 0:
+            # The first block always spans seconds_per_read or more.
+            return start + 1
+
+        block_end_times = self.block_end_times
+        first_data_time = block_end_times[start]
+        window_start = start
+        window_size = 1024
+        while window_start < block_end_times.size:
+            window = block_end_times[window_start:window_start + window_size]
+            is_past = ~(window - first_data_time < self.seconds_per_read)
+            if is_past.any():
+                return window_start + is_past.argmax() + 1
+            window_start += window_size
+            window_size *= 2
+        return block_end_times.size
+
     #@profile
-    def read_one_block(self) -> tuple[str, BufferData]:
-        block = self.raw_reader.next_block()
-        if block is None:
-            return (None, None)
-
-        block_type = block['type']
-        if block_type == 1:
-            # Block has one spike event with timestamp, channel, and unit.
-            return self.block_spike_event(block)
-        elif block_type == 4:
-            # Block has one other event with timestamp, value.
-            return self.block_event(block)
-        elif block_type == 5:
-            # Block has a waveform signal chunk.
-            return self.block_signal_chunk(block)
-        else:  # pragma: no cover
-            logging.warning(f"Ignoring block of unknown type {block_type}.")
-            return (None, None)
+    def read_blocks_one_at_a_time(self, start: int, stop: int) -> dict[str, BufferData]:
+        """Read blocks from start to stop, building results block by block."""
+        results = {}
+        for index in range(start, stop):
+            name_id = self.block_name_ids.item(index)
+            if name_id == 0:
+                # Don't bother with waveforms or events for channels we're not keeping.
+                self.raw_reader.skip_blocks(1)
+                continue
+            block = self.raw_reader.next_block_values()
+            self.block_handlers[block[0]](block, self.kept_names[name_id], results)
+
+        for name, data in results.items():
+            if isinstance(data, list):
+                # Convert event rows to an array once per channel, rather than allocating an array per event.
+                results[name] = NumericEventList(np.array(data, dtype=np.float64))
+            elif isinstance(data, SignalChunk):
+                # Scale signal chunks from raw int16 ADC values to real units, all at once per channel.
+                gain = self.raw_reader.gain_per_slow_channel[data.channel_ids[0]]
+                data.sample_data = data.sample_data * gain
+
+        return results
 
     #@profile
-    def block_spike_event(self, block: dict[str, Any]) -> tuple[str, BufferData]:
-        channel_id = block['channel']
-        name = self.spike_channel_names.get(channel_id, "skip")
-        event_list = NumericEventList(np.array([[block['timestamp_seconds'], channel_id, block['unit']]]))
-        return (name, event_list)
+    def block_spike_event(self, block: tuple, name: str, results: dict[str, Any]) -> None:
+        """Spike blocks have one spike event with timestamp, channel, and unit."""
+        (_, _, _, timestamp_seconds, channel_id, unit, _, _) = block
+        if name in results:
+            results[name].append((timestamp_seconds, channel_id, unit))
+        else:
+            results[name] = [(timestamp_seconds, channel_id, unit)]
 
     #@profile
-    def block_event(self, block: dict[str, Any]) -> tuple[str, BufferData]:
-        channel_id = block['channel']
-        name = self.event_channel_names.get(channel_id, "skip")
-        event_list = NumericEventList(np.array([[block['timestamp_seconds'], block['unit']]]))
-        return (name, event_list)
+    def block_event(self, block: tuple, name: str, results: dict[str, Any]) -> None:
+        """Other event blocks have one event with timestamp, value."""
+        (_, _, _, timestamp_seconds, channel_id, unit, _, _) = block
+        if name in results:
+            results[name].append((timestamp_seconds, unit))
+        else:
+            results[name] = [(timestamp_seconds, unit)]
 
     #@profile
-    def block_signal_chunk(self, block: dict[str, Any]) -> tuple[str, BufferData]:
-        channel_id = block['channel']
-        name = self.signal_channel_names.get(channel_id, "skip")
+    def block_signal_chunk(self, block: tuple, name: str, results: dict[str, Any]) -> None:
+        """Slow blocks have a waveform signal chunk, still as raw int16 values."""
+        (_, _, _, timestamp_seconds, channel_id, _, frequency, waveforms) = block
         signal_chunk = SignalChunk(
-            sample_data=block['waveforms'].reshape([-1, 1]),
-            sample_frequency=float(block['frequency']),
-            first_sample_time=float(block['timestamp_seconds']),
+            sample_data=waveforms.reshape([-1, 1]),
+            sample_frequency=float(frequency),
+            first_sample_time=float(timestamp_seconds),
+            channel_ids=[int(channel_id)]
+        )
+        if name in results:
+            results[name].append(signal_chunk)
+        else:
+            results[name] = signal_chunk
+
+    #@profile
+    def batch_spike_events(self, block_indexes: np.ndarray) -> BufferData:
+        """Spike blocks have one spike event each with timestamp, channel, and unit."""
+        block_headers = self.raw_reader.block_headers[block_indexes]
+        event_data = np.empty([block_indexes.size, 3], dtype=np.float64)
+        event_data[:, 0] = self.raw_reader.block_timestamps_seconds[block_indexes]
+        event_data[:, 1] = block_headers["Channel"]
+        event_data[:, 2] = block_headers["Unit"]
+        return NumericEventList(event_data)
+
+    #@profile
+    def batch_events(self, block_indexes: np.ndarray) -> BufferData:
+        """Other event blocks have one event each with timestamp, value."""
+        event_data = np.empty([block_indexes.size, 2], dtype=np.float64)
+        event_data[:, 0] = self.raw_reader.block_timestamps_seconds[block_indexes]
+        event_data[:, 1] = self.raw_reader.block_headers["Unit"][block_indexes]
+        return NumericEventList(event_data)
+
+    #@profile
+    def batch_signal_chunk(self, block_indexes: np.ndarray) -> BufferData:
+        """Slow blocks each have a waveform, which we join into one signal chunk."""
+        raw_reader = self.raw_reader
+        block_headers = raw_reader.block_headers[block_indexes]
+        file_offsets = raw_reader.block_offsets[block_indexes] + block_header_size
+        sample_counts = block_headers["NumberOfWaveforms"].astype(np.int64) * block_headers["NumberOfWordsInWaveform"]
+        waveforms = [
+            raw_reader.consume_block_waveforms(file_offset, sample_count, 1)
+            for file_offset, sample_count in zip(file_offsets.tolist(), sample_counts.tolist())
+        ]
+
+        # Scale from raw int16 ADC values to real units, all at once.
+        channel_id = block_headers["Channel"].item(0)
+        sample_data = np.concatenate(waveforms) * raw_reader.gain_per_slow_channel[channel_id]
+        return SignalChunk(
+            sample_data=sample_data.reshape([-1, 1]),
+            sample_frequency=float(raw_reader.frequency_per_slow_channel[channel_id]),
+            first_sample_time=raw_reader.block_timestamps_seconds.item(block_indexes[0]),
             channel_ids=[int(channel_id)]
         )
-        return (name, signal_chunk)
 
     def get_initial(self) -> dict[str, BufferData]:
         """Peek at the .plx file so we can read headers and configure initial buffers -- but not consume data blocks yet."""
         initial = {}
-        with PlexonPlxRawReader(self.plx_file) as peek_reader:
+        with PlexonPlxRawReader(self.plx_file, headers_only=True) as peek_reader:
             # Spike channels have numeric events like [timestamp, channel_id, unit_id]
             spike_channel_names = self.choose_channel_names(
                 peek_reader.dsp_channel_headers,
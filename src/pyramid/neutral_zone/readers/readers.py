@@ -3,6 +3,8 @@ from typing import Any, ContextManager
 from dataclasses import dataclass, field
 import logging
 
+import numpy as np
+
 from pyramid.model.model import DynamicImport, BufferData, Buffer
 from pyramid.model.events import NumericEventList
 from pyramid.neutral_zone.transformers.transformers import Transformer
@@ -74,7 +76,7 @@ class Reader(DynamicImport, ContextManager):
         raise NotImplementedError  # pragma: no cover
 
 
-@dataclass
+@dataclass(slots=True)
 class ReaderRoute():
     """Specify the mapping from a reader get_initial() or read_next() diciontary entry to a named buffer."""
 
@@ -88,7 +90,7 @@ class ReaderRoute():
     """Optional data transformations between reader and buffer, applied in order."""
 
 
-@dataclass
+@dataclass(slots=True)
 class ReaderSyncConfig():
     """Specify configuration for how a reader should find sync events and correct for clock drift."""
 
@@ -113,6 +115,44 @@ class ReaderSyncConfig():
     """
 
 
+class SyncEventTimes():
+    """A growable array of sync event times, doubling its capacity as needed for amortized O(1) appends."""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, capacity: int = 16) -> None:
+        self.data = np.empty(capacity, dtype=np.float64)
+        self.size = 0
+
+    def __eq__(self, other: object) -> bool:
+        """Compare times as-a-whole, with other SyncEventTimes or array-likes, to support use of this class in tests."""
+        if isinstance(other, self.__class__):
+            other = other.view()
+        return np.array_equal(self.view(), other)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, time: float) -> None:
+        """Add one time at the end, growing capacity if needed."""
+        if self.size == self.data.size:
+            self.data = np.resize(self.data, 2 * self.data.size)
+        self.data[self.size] = time
+        self.size += 1
+
+    def extend(self, times: np.ndarray) -> None:
+        """Add several times at the end, growing capacity once if needed."""
+        new_size = self.size + len(times)
+        if new_size > self.data.size:
+            self.data = np.resize(self.data, max(new_size, 2 * self.data.size))
+        self.data[self.size:new_size] = times
+        self.size = new_size
+
+    def view(self) -> np.ndarray:
+        """Get the times recorded so far, as an array view that's valid until the next append."""
+        return self.data[:self.size]
+
+
 class ReaderSyncRegistry():
     """Keep track of sync events as seen by different readers, and clock drift compared to a referencce reader.
 
@@ -145,6 +185,8 @@ class ReaderSyncRegistry():
         true then looking for small differences between readers is a good way to discover which times go together.
     """
 
+    __slots__ = ("reference_reader_name", "event_times")
+
     def __init__(
         self,
         reference_reader_name: str
@@ -164,9 +206,19 @@ class ReaderSyncRegistry():
 
     def record_event(self, reader_name: str, event_time: float) -> None:
         """Record a sync event as seen by the named reader."""
-        reader_event_times = self.event_times.get(reader_name, [])
+        reader_event_times = self.event_times.get(reader_name, None)
+        if reader_event_times is None:
+            reader_event_times = SyncEventTimes()
+            self.event_times[reader_name] = reader_event_times
         reader_event_times.append(event_time)
-        self.event_times[reader_name] = reader_event_times
+
+    def record_events(self, reader_name: str, event_times: np.ndarray) -> None:
+        """Record several sync events at once, as seen by the named reader."""
+        reader_event_times = self.event_times.get(reader_name, None)
+        if reader_event_times is None:
+            reader_event_times = SyncEventTimes()
+            self.event_times[reader_name] = reader_event_times
+        reader_event_times.extend(event_times)
 
     def get_drift(
         self,
@@ -174,30 +226,35 @@ class ReaderSyncRegistry():
         reference_end_time: float = None,
         reader_end_time: float = None
     ) -> float:
-        """Estimate clock drift between the named reader and the reference, based on events marked for each reader."""
+        """Estimate clock drift between the named reader and the reference, based on events marked for each reader.
+
+        This assumes sync event times were recorded in increasing order, as they are when read in sequence.
+        """
         reference_event_times = self.event_times.get(self.reference_reader_name, None)
         if not reference_event_times:
             return 0.0
 
+        reference_event_times = reference_event_times.view()
         if reference_end_time is not None:
-            reference_event_times = [time for time in reference_event_times if time <= reference_end_time]
+            reference_event_times = reference_event_times[:np.searchsorted(reference_event_times, reference_end_time, side='right')]
 
         reader_event_times = self.event_times.get(reader_name, None)
         if not reader_event_times:
             return 0.0
 
+        reader_event_times = reader_event_times.view()
         if reader_end_time is not None:
-            reader_event_times = [time for time in reader_event_times if time <= reader_end_time]
+            reader_event_times = reader_event_times[:np.searchsorted(reader_event_times, reader_end_time, side='right')]
 
         reader_last = reader_event_times[-1]
-        reader_offsets = [reader_last - ref_time for ref_time in reference_event_times]
-        drift_from_reader = min(reader_offsets, key=abs)
+        reader_offsets = reader_last - reference_event_times
+        drift_from_reader = reader_offsets[np.abs(reader_offsets).argmin()]
 
         reference_last = reference_event_times[-1]
-        reference_offsets = [reader_time - reference_last for reader_time in reader_event_times]
-        drift_from_reference = min(reference_offsets, key=abs)
+        reference_offsets = reader_event_times - reference_last
+        drift_from_reference = reference_offsets[np.abs(reference_offsets).argmin()]
 
-        return min(drift_from_reader, drift_from_reference, key=abs)
+        return float(min(drift_from_reader, drift_from_reference, key=abs))
 
 
 class ReaderRouter():
@@ -223,6 +280,25 @@ class ReaderRouter():
         self.sync_config = sync_config
         self.sync_registry = sync_registry
 
+        # Routes, buffers, and transformers are fixed, so look up each route's buffer once, here.
+        # Group routes by reader result so each result is looked up once per read, no matter how many routes use it.
+        # Routes without transformers go first, since they don't modify the data.
+        # Transformers may modify data in place, so each transformer chain gets its own copy --
+        # except the last chain for each result, which can have the reader's data since no other route will see it.
+        self.route_groups = {}
+        for route in routes:
+            buffer = named_buffers.get(route.buffer_name, None)
+            if buffer:
+                transformers = tuple(route.transformers)
+                self.route_groups.setdefault(route.reader_result_name, []).append((route, buffer, transformers))
+        for reader_result_name, group in self.route_groups.items():
+            group.sort(key=lambda resolved_route: bool(resolved_route[2]))
+            last_index = len(group) - 1
+            self.route_groups[reader_result_name] = [
+                (route, buffer, transformers, bool(transformers) and index < last_index)
+                for index, (route, buffer, transformers) in enumerate(group)
+            ]
+
         self.reader_exception = None
         self.max_buffer_time = 0.0
         self.clock_drift = 0.0
@@ -273,44 +349,49 @@ class ReaderRouter():
                     event_value=self.sync_config.event_value,
                     value_index=self.sync_config.event_value_index
                 )
-                for event_time in sync_event_times:
-                    self.sync_registry.record_event(self.sync_config.reader_name, event_time)
+                if sync_event_times.size:
+                    self.sync_registry.record_events(self.sync_config.reader_name, sync_event_times)
 
-        for route in self.routes:
-            buffer = self.named_buffers.get(route.buffer_name, None)
-            if not buffer:
-                continue
-
-            data = read_result.get(route.reader_result_name, None)
+        for reader_result_name, route_group in self.route_groups.items():
+            data = read_result.get(reader_result_name, None)
             if not data:
                 continue
 
-            data_copy = data.copy()
-            if route.transformers:
+            for route, buffer, transformers, needs_copy in route_group:
+                if transformers:
+                    # Transformers may modify data in place, so give them a copy if another route will see the data.
+                    data_copy = data.copy() if needs_copy else data
+                    try:
+                        for transformer in transformers:
+                            data_copy = transformer.transform(data_copy)
+                    except Exception as exception:
+                        logging.error(
+                            f"Route transformer had an exception, skipping data for {route.reader_result_name} -> {route.buffer_name}:",
+                            exc_info=True
+                        )
+                        continue
+                else:
+                    # Buffer append() copies data into the buffer's own arrays, so we don't need a copy of our own.
+                    data_copy = data
+
                 try:
-                    for transformer in route.transformers:
-                        data_copy = transformer.transform(data_copy)
+                    buffer.data.append(data_copy)
                 except Exception as exception:
                     logging.error(
-                        f"Route transformer had an exception, skipping data for {route.reader_result_name} -> {route.buffer_name}:",
+                        f"Route buffer had exception appending data, skipping data for {route.reader_result_name} -> {route.buffer_name}:",
                         exc_info=True
                     )
                     continue
 
-            try:
-                buffer.data.append(data_copy)
-            except Exception as exception:
-                logging.error(
-                    "Route buffer had exception appending data, skipping data for {route.reader_result_name} -> {route.buffer_name}:",
-                    exc_info=True
-                )
-                continue
-
-        # Update the high water mark for the reader -- the latest timestamp seen so far.
-        for buffer in self.named_buffers.values():
-            buffer_end_time = buffer.data.get_end_time()
-            if buffer_end_time and buffer_end_time > self.max_buffer_time:
-                self.max_buffer_time = buffer_end_time
+                # Update the high water mark for the reader -- the latest timestamp seen so far.
+                # Only buffers we just appended to can have new end times, so we don't need to check the others.
+                if isinstance(data_copy, NumericEventList):
+                    # Event list end times scan all events, but only the new events can raise the high water mark.
+                    buffer_end_time = data_copy.get_end_time()
+                else:
+                    buffer_end_time = buffer.data.get_end_time()
+                if buffer_end_time and buffer_end_time > self.max_buffer_time:
+                    self.max_buffer_time = buffer_end_time
 
         return True
 
@@ -318,10 +399,15 @@ class ReaderRouter():
         """Ask the reader to read data 0 or more times until catching up to a target time.
 
         Return the latest timestamp seen, so far.
+        Once the reader is done or disabled it stays that way, so stop right away instead of retrying empty reads.
         """
         empty_reads = 0
         target_reader_time = target_reference_time + self.clock_drift
-        while self.max_buffer_time < target_reader_time and empty_reads <= self.empty_reads_allowed:
+        while (
+            not self.reader_exception
+            and self.max_buffer_time < target_reader_time
+            and empty_reads <= self.empty_reads_allowed
+        ):
             got_data = self.route_next()
             if got_data:
                 empty_reads = 0
@@ -2,8 +2,14 @@ from types import TracebackType
 from typing import Self, Any, ContextManager
 import logging
 from pathlib import Path
+import re
 
 import yaml
+try:
+    # Use faster, libyaml-based parsing and emitting when available.
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader, SafeDumper
 
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
@@ -108,10 +114,16 @@ class PlotFigureController(ContextManager):
         # Reposition figures from a given plot positions YAML file.
         if self.plot_positions_yaml and Path(self.plot_positions_yaml).exists():
             with open(self.plot_positions_yaml, 'r') as f:
-                plot_positions = yaml.safe_load(f)
+                plot_positions = yaml.load(f, Loader=SafeLoader)
+
+            # Window borders and title bars are the same for all figures, so measure geometry offsets just once.
+            offsets = None
             for fig in self.figures.values():
                 figure_key = str(fig.number)
-                set_figure_position(fig, plot_positions.get(figure_key, None))
+                position = plot_positions.get(figure_key, None)
+                if position is not None and offsets is None:
+                    offsets = measure_geometry_offsets(fig)
+                set_figure_position(fig, position, offsets)
 
         # Let each plotter set itself up.
         for plotter, fig in self.figures.items():
@@ -128,9 +140,11 @@ class PlotFigureController(ContextManager):
 
     def update(self) -> None:
         """Let figure window process async, inteactive UI events."""
+        # Figures share the backend's GUI event loop, so flushing events for one open figure flushes them for all.
         for fig in self.figures.values():
             if plt.fignum_exists(fig.number):
                 fig.canvas.flush_events()
+                return
 
     def __exit__(
         self,
@@ -150,13 +164,15 @@ class PlotFigureController(ContextManager):
         # Record figure positions to be restored later.
         if self.plot_positions_yaml:
             with open(self.plot_positions_yaml, 'w') as f:
-                yaml.safe_dump(plot_positions, f)
+                yaml.dump(plot_positions, f, Dumper=SafeDumper)
 
     def get_open_figures(self) -> list[Figure]:
         return [figure for figure in self.figures.values() if plt.fignum_exists(figure.number)]
 
     def stil_going(self) -> bool:
-        return len(self.get_open_figures()) > 0 and not any([plotter.please_quit for plotter in self.plotters])
+        # Stop at the first open figure or quit request, instead of building lists of them all.
+        any_open = any(plt.fignum_exists(figure.number) for figure in self.figures.values())
+        return any_open and not any(plotter.please_quit for plotter in self.plotters)
 
 
 # Here are several utils for wrangling figure window positions.
@@ -187,14 +203,13 @@ def format_geometry(position: dict[str, int]) -> str:
     return f"{position['width']}x{position['height']}+{position['x']}+{position['y']}"
 
 
+# A tkinter "geometry" string like "640x480+10+20", or "640x480+-10+20" for windows partly off screen.
+geometry_pattern = re.compile(r"(\d+)x(\d+)\+(-?\d+)\+(-?\d+)")
+
+
 def parse_geometry(geometry: str) -> dict[str, int]:
     """Parse a tkinter "geometry" string into explicit width, height, x, and y."""
-    geometry_parts = geometry.split("+")
-    x = int(geometry_parts[1])
-    y = int(geometry_parts[2])
-    size_parts = geometry_parts[0].split("x")
-    width = int(size_parts[0])
-    height = int(size_parts[1])
+    (width, height, x, y) = map(int, geometry_pattern.match(geometry).groups())
     return {
         "width": width,
         "height": height,
@@ -203,18 +218,20 @@ def parse_geometry(geometry: str) -> dict[str, int]:
     }
 
 
-def set_figure_position(fig: Figure, position: dict[str, int]) -> None:
+def set_figure_position(fig: Figure, position: dict[str, int], offsets: dict[str, int] = None) -> None:
     """Set the figure's current position given position values corresponding to tkinter "winfo_*()" functions.
 
     For whatever reason, tkinter "winfo_*()" functions seem to be more accurate than the "geometry()" function.
     But the "geometry()" function is the only way to set the position!
     So, before setting with geometry(), measure the offsets between the "winfo_*()" and "geometry()" APIs.
+    Pass in offsets already measured from another figure to skip measuring them again.
     """
     if position is None:  # pragma: no cover
         return
 
     if looks_like_tkinter(fig):
-        offsets = measure_geometry_offsets(fig)
+        if offsets is None:
+            offsets = measure_geometry_offsets(fig)
         corrected_position = {
             "width": position["width"] + offsets["width"],
             "height": position["height"] + offsets["height"],
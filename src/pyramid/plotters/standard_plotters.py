@@ -1,13 +1,18 @@
-from typing import Any
+from typing import Any, Callable
 import time
 import re
 from binascii import crc32
+from functools import lru_cache
 
 import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.pyplot import get_cmap
 from matplotlib.widgets import Button
 
+from pyramid.model.events import NumericEventList
+from pyramid.model.signals import SignalChunk
 from pyramid.trials.trials import Trial
 from pyramid.plotters.plotters import Plotter
 
@@ -17,8 +22,12 @@ color_count = 14
 color_map = get_cmap('brg', color_count)
 
 
-def name_to_color(name: str, alpha: float = 1.0) -> str:
-    """Choose a color that corresponds in a stable way to the name of a data element."""
+@lru_cache(maxsize=1024)
+def name_to_color(name: str, alpha: float = 1.0) -> tuple[float, float, float, float]:
+    """Choose a color that corresponds in a stable way to the name of a data element.
+
+    Plotters ask for the same few names and alphas on every update, so remember recent results.
+    """
     hash = crc32(name.encode("utf-8"))
     index = hash % color_count
     return color_map(index, alpha=alpha)
@@ -32,6 +41,80 @@ def format_number(number):
         return '{:.3f} sec'.format(number)
 
 
+def autoscale_to_artists(ax: Axes) -> None:
+    """Recompute data limits from the artists currently on the axes, which might have changed since the last autoscale."""
+    ax.relim()
+
+    # Not all matplotlib versions account for collections in relim(), so add points from scatter(), etc. explicitly.
+    for collection in ax.collections:
+        ax.update_datalim(collection.get_offsets())
+
+    ax.autoscale_view()
+
+
+def show_legend(ax: Axes, show: bool) -> None:
+    """Show or update the legend for labeled artists, or remove any legend that's there."""
+    if show:
+        ax.legend()
+    else:
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+
+
+def scatter_by_name(
+    ax: Axes,
+    named_points: dict[str, tuple[np.ndarray, np.ndarray]],
+    alpha: float,
+    marker: str,
+    labels: bool
+) -> list[Artist]:
+    """Scatter x and y points for several names as one collection, colored by name.
+
+    This is quicker to create and draw than one collection per name.
+    If labels is True, also add an empty, labeled collection per name, to show in the legend.
+    """
+    if not named_points:
+        return []
+
+    colors = [
+        np.tile(name_to_color(name, alpha), (np.size(x), 1))
+        for name, (x, y) in named_points.items()
+    ]
+    artists = [
+        ax.scatter(
+            np.concatenate([np.ravel(x) for x, y in named_points.values()]),
+            np.concatenate([np.ravel(y) for x, y in named_points.values()]),
+            color=np.concatenate(colors),
+            marker=marker
+        )
+    ]
+    if labels:
+        artists += [ax.scatter([], [], color=name_to_color(name, alpha), marker=marker, label=name) for name in named_points]
+    return artists
+
+
+class HistoryArtists():
+    """Keep artists plotted for a rolling history of trials, so plotters can add and remove a few instead of redrawing all."""
+
+    def __init__(self) -> None:
+        self.old = []
+        self.latest = []
+
+    def fade_latest(self, history: list[Any], plot_old: Callable[[Any], list[Artist]]) -> None:
+        """Replace the latest full-color artists with faded ones from plot_old(), and remove any older than the history."""
+        for artist in self.latest:
+            artist.remove()
+        self.latest = []
+
+        if history:
+            self.old.append(plot_old(history[-1]))
+
+        while len(self.old) > len(history):
+            for artist in self.old.pop(0):
+                artist.remove()
+
+
 class BasicInfoPlotter(Plotter):
     """Show static experiment and subject data and progress through trials.  Also a Quit button."""
 
@@ -113,10 +196,12 @@ class NumericEventsPlotter(Plotter):
     ) -> None:
         self.history_size = history_size
         self.history = []
+        self.history_artists = HistoryArtists()
 
         self.xmin = xmin
         self.xmax = xmax
         self.match_pattern = match_pattern
+        self.name_pattern = None if match_pattern is None else re.compile(match_pattern)
         self.ylabel = ylabel
         self.value_index = value_index
         self.marker = marker
@@ -130,16 +215,6 @@ class NumericEventsPlotter(Plotter):
     ) -> None:
         self.ax = fig.subplots()
         self.ax.set_axisbelow(True)
-
-    def update(
-        self,
-        fig: Figure,
-        current_trial: Trial,
-        trial_number: int,
-        experiment_info: dict[str: Any],
-        subject_info: dict[str: Any]
-    ) -> None:
-        self.ax.clear()
         self.ax.grid(which="major", axis="both")
         self.ax.set_xlabel("trial time (s)")
         self.ax.set_ylabel(self.ylabel)
@@ -149,41 +224,44 @@ class NumericEventsPlotter(Plotter):
         else:
             self.ax.set_title("Numeric Events")
 
+    def plot_events(self, events: dict[str, NumericEventList], alpha: float, marker: str, labels: bool) -> list[Artist]:
+        named_points = {
+            name: (data.get_times(), data.get_values(value_index=self.value_index))
+            for name, data in events.items()
+        }
+        return scatter_by_name(self.ax, named_points, alpha, marker, labels)
+
+    def update(
+        self,
+        fig: Figure,
+        current_trial: Trial,
+        trial_number: int,
+        experiment_info: dict[str: Any],
+        subject_info: dict[str: Any]
+    ) -> None:
         # Show old events faded out.
-        for old in self.history:
-            for name, data in old.items():
-                self.ax.scatter(
-                    data.get_times(),
-                    data.get_values(value_index=self.value_index),
-                    color=name_to_color(name, 0.125),
-                    marker=self.old_marker,
-                )
+        self.history_artists.fade_latest(self.history, lambda old: self.plot_events(old, 0.125, self.old_marker, False))
 
         # Update finite, rolling history.
         new = {
             name: event_list
             for name, event_list in current_trial.numeric_events.items()
-            if (self.match_pattern is None or re.fullmatch(self.match_pattern, name)) and event_list.event_count() > 0
+            if (self.name_pattern is None or self.name_pattern.fullmatch(name)) and event_list.event_count() > 0
         }
         self.history.append(new)
         self.history = self.history[-self.history_size:]
 
         # Show new events on top in full color.
-        for name, data in new.items():
-            self.ax.scatter(
-                data.get_times(),
-                data.get_values(value_index=self.value_index),
-                color=name_to_color(name),
-                marker=self.marker,
-                label=name
-            )
+        self.history_artists.latest = self.plot_events(new, 1.0, self.marker, True)
 
-        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax)
-        if new:
-            self.ax.legend()
+        autoscale_to_artists(self.ax)
+        # Apply limits after autoscaling, with auto=None to leave autoscaling on for any limits that are None.
+        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax, auto=None)
+        show_legend(self.ax, bool(new))
 
     def clean_up(self, fig: Figure) -> None:
         self.history = []
+        self.history_artists = HistoryArtists()
 
 
 class SignalChunksPlotter(Plotter):
@@ -200,10 +278,12 @@ class SignalChunksPlotter(Plotter):
     ) -> None:
         self.history_size = history_size
         self.history = []
+        self.history_artists = HistoryArtists()
 
         self.xmin = xmin
         self.xmax = xmax
         self.match_pattern = match_pattern
+        self.name_pattern = None if match_pattern is None else re.compile(match_pattern)
         self.channel_ids = channel_ids
         self.ylabel = ylabel
 
@@ -215,16 +295,6 @@ class SignalChunksPlotter(Plotter):
     ) -> None:
         self.ax = fig.subplots()
         self.ax.set_axisbelow(True)
-
-    def update(
-        self,
-        fig: Figure,
-        current_trial: Trial,
-        trial_number: int,
-        experiment_info: dict[str: Any],
-        subject_info: dict[str: Any]
-    ) -> None:
-        self.ax.clear()
         self.ax.grid(which="major", axis="both")
         self.ax.set_xlabel("trial time (s)")
         self.ax.set_ylabel(self.ylabel)
@@ -234,47 +304,54 @@ class SignalChunksPlotter(Plotter):
         else:
             self.ax.set_title("Signals")
 
+    def plot_chunks(self, chunks: dict[str, SignalChunk], alpha: float, labels: bool) -> list[Artist]:
+        artists = []
+        for name, data in chunks.items():
+            if self.channel_ids:
+                ids = [channel_id for channel_id in self.channel_ids if channel_id in data.channel_ids]
+            else:
+                ids = data.channel_ids
+            for channel_id in ids:
+                full_name = f"{name} {channel_id}"
+                artists += self.ax.plot(
+                    data.get_times(),
+                    data.get_channel_values(channel_id),
+                    color=name_to_color(full_name, alpha),
+                    label=full_name if labels else None
+                )
+        return artists
+
+    def update(
+        self,
+        fig: Figure,
+        current_trial: Trial,
+        trial_number: int,
+        experiment_info: dict[str: Any],
+        subject_info: dict[str: Any]
+    ) -> None:
         # Show old events faded out.
-        for old_chunks in self.history:
-            for name, data in old_chunks.items():
-                if self.channel_ids:
-                    ids = [channel_id for channel_id in self.channel_ids if channel_id in data.channel_ids]
-                else:
-                    ids = data.channel_ids
-                for channel_id in ids:
-                    full_name = f"{name} {channel_id}"
-                    self.ax.plot(data.get_times(), data.get_channel_values(
-                        channel_id), color=name_to_color(full_name, 0.125))
+        self.history_artists.fade_latest(self.history, lambda old_chunks: self.plot_chunks(old_chunks, 0.125, False))
 
         # Update finite, rolling history.
         new = {
             name: signal_chunk
             for name, signal_chunk in current_trial.signals.items()
-            if (self.match_pattern is None or re.fullmatch(self.match_pattern, name)) and signal_chunk.sample_count() > 0
+            if (self.name_pattern is None or self.name_pattern.fullmatch(name)) and signal_chunk.sample_count() > 0
         }
         self.history.append(new)
         self.history = self.history[-self.history_size:]
 
         # Show new events on top in full color.
-        for name, data in new.items():
-            if self.channel_ids:
-                ids = [channel_id for channel_id in self.channel_ids if channel_id in data.channel_ids]
-            else:
-                ids = data.channel_ids
-            for channel_id in ids:
-                full_name = f"{name} {channel_id}"
-                self.ax.plot(
-                    data.get_times(),
-                    data.get_channel_values(channel_id),
-                    color=name_to_color(full_name),
-                    label=full_name)
+        self.history_artists.latest = self.plot_chunks(new, 1.0, True)
 
-        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax)
-        if new:
-            self.ax.legend()
+        autoscale_to_artists(self.ax)
+        # Apply limits after autoscaling, with auto=None to leave autoscaling on for any limits that are None.
+        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax, auto=None)
+        show_legend(self.ax, bool(new))
 
     def clean_up(self, fig: Figure) -> None:
         self.history = []
+        self.history_artists = HistoryArtists()
 
 
 class EnhancementTimesPlotter(Plotter):
@@ -292,11 +369,13 @@ class EnhancementTimesPlotter(Plotter):
     ) -> None:
         self.history_size = history_size
         self.history = []
+        self.history_artists = HistoryArtists()
 
         self.xmin = xmin
         self.xmax = xmax
         self.enhancement_categories = enhancement_categories
         self.match_pattern = match_pattern
+        self.name_pattern = None if match_pattern is None else re.compile(match_pattern)
 
         self.marker = marker
         self.old_marker = old_marker
@@ -309,7 +388,23 @@ class EnhancementTimesPlotter(Plotter):
     ) -> None:
         self.ax = fig.subplots()
         self.ax.set_axisbelow(True)
+        self.ax.grid(which="major", axis="both")
+        self.ax.set_xlabel("trial time (s)")
+
+        if self.match_pattern:
+            self.ax.set_title(f"Enhancement Times: {self.enhancement_categories} {self.match_pattern}")
+        else:
+            self.ax.set_title(f"Enhancement Times: {self.enhancement_categories}")
+
         self.all_names = []
+        self.name_rows = {}
+
+    def plot_times(self, named_times: dict[str, list[float]], alpha: float, marker: str, labels: bool) -> list[Artist]:
+        named_points = {}
+        for name, times in named_times.items():
+            row = self.name_rows[name]
+            named_points[name] = (times, row * np.ones([1, len(times)]))
+        return scatter_by_name(self.ax, named_points, alpha, marker, labels)
 
     def update(
         self,
@@ -319,23 +414,8 @@ class EnhancementTimesPlotter(Plotter):
         experiment_info: dict[str: Any],
         subject_info: dict[str: Any]
     ) -> None:
-        self.ax.clear()
-        self.ax.grid(which="major", axis="both")
-        self.ax.set_xlabel("trial time (s)")
-
-        if self.match_pattern:
-            self.ax.set_title(f"Enhancement Times: {self.enhancement_categories} {self.match_pattern}")
-        else:
-            self.ax.set_title(f"Enhancement Times: {self.enhancement_categories}")
-
         # Show old events faded out.
-        for old in self.history:
-            for name, times in old.items():
-                row = self.all_names.index(name)
-                self.ax.scatter(
-                    times, row * np.ones([1, len(times)]),
-                    color=name_to_color(name, 0.125),
-                    marker=self.old_marker)
+        self.history_artists.fade_latest(self.history, lambda old: self.plot_times(old, 0.125, self.old_marker, False))
 
         # Update finite, rolling history.
         enhancement_names = []
@@ -344,26 +424,25 @@ class EnhancementTimesPlotter(Plotter):
 
         new = {}
         for name in enhancement_names:
-            if self.match_pattern is None or re.fullmatch(self.match_pattern, name):
+            if self.name_pattern is None or self.name_pattern.fullmatch(name):
                 new[name] = current_trial.get_enhancement(name, [])
-                if name not in self.all_names:
+                if name not in self.name_rows:
+                    self.name_rows[name] = len(self.all_names)
                     self.all_names.append(name)
         self.history.append(new)
         self.history = self.history[-self.history_size:]
 
         # Show new events on top in full color.
-        for name, times in new.items():
-            row = self.all_names.index(name)
-            self.ax.scatter(
-                times, row * np.ones([1, len(times)]),
-                color=name_to_color(name),
-                label=name, marker=self.marker)
+        self.history_artists.latest = self.plot_times(new, 1.0, self.marker, True)
 
+        autoscale_to_artists(self.ax)
+        # Apply limits after autoscaling, with auto=None to leave autoscaling on for any limits that are None.
+        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax, auto=None)
         self.ax.set_yticks(range(len(self.all_names)), self.all_names)
-        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax)
 
     def clean_up(self, fig: Figure) -> None:
         self.history = []
+        self.history_artists = HistoryArtists()
 
 
 class EnhancementXYPlotter(Plotter):
@@ -387,6 +466,7 @@ class EnhancementXYPlotter(Plotter):
 
         self.history_size = history_size
         self.history = []
+        self.history_artists = HistoryArtists()
 
         self.xmin = xmin
         self.xmax = xmax
@@ -405,6 +485,28 @@ class EnhancementXYPlotter(Plotter):
     ) -> None:
         self.ax = fig.subplots()
         self.ax.set_axisbelow(True)
+        self.ax.grid(which="major", axis="both")
+        self.ax.set_title(f"XY Value Pairs")
+        self.ax.set_xlabel("x")
+        self.ax.set_ylabel("y")
+
+    def plot_points(self, points: dict[str, tuple], alpha: float, marker: str, labels: bool) -> list[Artist]:
+        artists = []
+        for name, point in points.items():
+            label = name if labels else None
+            if isinstance(point[0], list):
+                artists += self.ax.plot(
+                    point[0],
+                    point[1],
+                    color=name_to_color(name, alpha),
+                    label=label,
+                    linestyle=self.linestyle,
+                    marker=marker,
+                    markevery=[-1]
+                )
+            else:
+                artists.append(self.ax.scatter(point[0], point[1], color=name_to_color(name, alpha), label=label, marker=marker))
+        return artists
 
     def update(
         self,
@@ -414,26 +516,8 @@ class EnhancementXYPlotter(Plotter):
         experiment_info: dict[str: Any],
         subject_info: dict[str: Any]
     ) -> None:
-        self.ax.clear()
-        self.ax.grid(which="major", axis="both")
-        self.ax.set_title(f"XY Value Pairs")
-        self.ax.set_xlabel("x")
-        self.ax.set_ylabel("y")
-
         # Show old events faded out.
-        for old in self.history:
-            for name, point in old.items():
-                if isinstance(point[0], list):
-                    self.ax.plot(
-                        point[0],
-                        point[1],
-                        color=name_to_color(name, 0.125),
-                        linestyle=self.linestyle,
-                        marker=self.old_marker,
-                        markevery=[-1]
-                    )
-                else:
-                    self.ax.scatter(point[0], point[1], color=name_to_color(name, 0.125), marker=self.old_marker)
+        self.history_artists.fade_latest(self.history, lambda old: self.plot_points(old, 0.125, self.old_marker, False))
 
         new = {}
         for x_name, y_name in self.xy_points.items():
@@ -460,27 +544,18 @@ class EnhancementXYPlotter(Plotter):
         self.history = self.history[-self.history_size:]
 
         # Show new events on top in full color.
-        for name, point in new.items():
-            if isinstance(point[0], list):
-                self.ax.plot(
-                    point[0],
-                    point[1],
-                    color=name_to_color(name),
-                    label=name,
-                    linestyle=self.linestyle,
-                    marker=self.marker,
-                    markevery=[-1]
-                )
-            else:
-                self.ax.scatter(point[0], point[1], color=name_to_color(name), label=name, marker=self.marker)
+        self.history_artists.latest = self.plot_points(new, 1.0, self.marker, True)
 
-        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax)
-        self.ax.set_ylim(ymin=self.ymin, ymax=self.ymax)
-        if new:
-            self.ax.legend()
+        if None in (self.xmin, self.xmax, self.ymin, self.ymax):
+            autoscale_to_artists(self.ax)
+        # Apply limits after autoscaling, with auto=None to leave autoscaling on for any limits that are None.
+        self.ax.set_xlim(xmin=self.xmin, xmax=self.xmax, auto=None)
+        self.ax.set_ylim(ymin=self.ymin, ymax=self.ymax, auto=None)
+        show_legend(self.ax, bool(new))
 
     def clean_up(self, fig: Figure) -> None:
         self.history = []
+        self.history_artists = HistoryArtists()
 
 
 class SpikeEventsPlotter(Plotter):
@@ -498,6 +573,7 @@ class SpikeEventsPlotter(Plotter):
         self.xmin = xmin
         self.xmax = xmax
         self.match_pattern = match_pattern
+        self.name_pattern = None if match_pattern is None else re.compile(match_pattern)
         self.value_selection = value_selection
         self.value_index = value_index
         self.marker = marker
@@ -524,6 +600,8 @@ class SpikeEventsPlotter(Plotter):
         self.ax.set_ylabel("trial number")
         self.ax.yaxis.get_major_locator().set_params(integer=True)
 
+        self.legend_names = set()
+
     def update(
         self,
         fig: Figure,
@@ -533,8 +611,9 @@ class SpikeEventsPlotter(Plotter):
         subject_info: dict[str: Any]
     ) -> None:
         # Add a row for this trial.
+        named_points = {}
         for name, event_list in current_trial.numeric_events.items():
-            if (self.match_pattern is None or re.fullmatch(self.match_pattern, name)) and event_list.event_count() > 0:
+            if (self.name_pattern is None or self.name_pattern.fullmatch(name)) and event_list.event_count() > 0:
                 times = event_list.get_times()
                 trials = trial_number * np.ones(times.shape)
                 if self.value_selection is not None:
@@ -543,7 +622,14 @@ class SpikeEventsPlotter(Plotter):
                     times = times[selector]
                     trials = trials[selector]
                 if times.size > 0:
-                    self.ax.scatter(times, trials, color=name_to_color(name, alpha=0.5), marker=self.marker, label=name)
+                    named_points[name] = (times, trials)
+        scatter_by_name(self.ax, named_points, 0.5, self.marker, labels=False)
+
+        # Add an empty, labeled collection for the legend, the first time we see each name.
+        for name in named_points:
+            if name not in self.legend_names:
+                self.ax.scatter([], [], color=name_to_color(name, alpha=0.5), marker=self.marker, label=name)
+                self.legend_names.add(name)
 
         ymax = np.ceil((trial_number + 1) / 10) * 10
         self.ax.set_ylim(ymin=0, ymax=ymax)
@@ -1,5 +1,8 @@
 import numpy as np
 
+from pytest import mark
+
+from pyramid.model import events
 from pyramid.model.events import NumericEventList
 
 
@@ -123,6 +126,27 @@ def test_numeric_list_copy_value_range_no_max():
     assert np.array_equal(range_event_list.get_values(), 10*np.array(range(40, 100)))
 
 
+@mark.parametrize("use_numba", [True, False])
+def test_numeric_list_copy_value_range_with_and_without_numba(monkeypatch, use_numba):
+    if not use_numba:
+        monkeypatch.setattr(events, "njit", None)
+
+    raw_data = [[t, 10*t, -t] for t in range(100)]
+    event_list = NumericEventList(np.array(raw_data, dtype=np.float64))
+
+    range_event_list = event_list.copy_value_range(min=-60, max=-40, value_index=1)
+    assert np.array_equal(range_event_list.event_data, np.array(raw_data[41:61]))
+
+    # Omitting both min and max should copy all events.
+    all_event_list = event_list.copy_value_range()
+    assert np.array_equal(all_event_list.event_data, event_list.event_data)
+    assert all_event_list.event_data is not event_list.event_data
+
+    # Nothing in range should give an empty list with the same number of columns.
+    empty_event_list = event_list.copy_value_range(min=1000)
+    assert empty_event_list.event_data.shape == (0, 3)
+
+
 def test_numeric_list_copy_time_range():
     event_count = 100
     raw_data = [[t, 10*t] for t in range(event_count)]
@@ -170,6 +170,29 @@ def test_signal_chunk_transform_channel_values():
     assert np.array_equal(signal_chunk.get_channel_values("c"), np.array(range(sample_count)) * 10)
 
 
+def test_signal_chunk_transform_in_place():
+    sample_count = 100
+    raw_data = [[v, 10 + v, 10 * v] for v in range(sample_count)]
+    sample_data = np.array(raw_data, dtype=np.float64)
+    signal_chunk = SignalChunk(
+        sample_data,
+        10,
+        0,
+        ["a", "b", "c"]
+    )
+
+    # Identity offset and gain should leave samples alone.
+    signal_chunk.apply_offset_then_gain(offset=0, gain=1)
+    assert np.array_equal(signal_chunk.sample_data, np.array(raw_data))
+
+    # Transforms should modify the original sample array, rather than replacing it with a copy.
+    signal_chunk.apply_offset_then_gain(offset=-500, gain=2)
+    signal_chunk.apply_offset_then_gain(offset=1, gain=1, channel_id="c")
+    assert signal_chunk.sample_data is sample_data
+    assert np.array_equal(sample_data[:, 0], (np.array(range(sample_count)) - 500) * 2)
+    assert np.array_equal(sample_data[:, 2], (np.array(range(sample_count)) * 10 - 500) * 2 + 1)
+
+
 def test_signal_chunk_copy_time_range():
     sample_count = 100
     raw_data = [[v, 10 + v, 10 * v] for v in range(sample_count)]
@@ -1,7 +1,10 @@
+import json
 import uuid
 import time
 
 import numpy as np
+import zmq
+from pytest import importorskip
 
 from pyramid.model.events import NumericEventList
 from pyramid.model.signals import SignalChunk
@@ -9,6 +12,7 @@ from pyramid.neutral_zone.readers.open_ephys_zmq import (
     format_heartbeat,
     parse_heartbeat,
     format_continuous_data,
+    format_continuous_data_block,
     parse_continuous_data,
     ttl_data_to_bytes,
     ttl_data_from_bytes,
@@ -16,6 +20,8 @@ from pyramid.neutral_zone.readers.open_ephys_zmq import (
     parse_event,
     format_spike,
     parse_spike,
+    peek_data_type,
+    parse_message,
     OpenEphysZmqClient,
     OpenEphysZmqServer,
     OpenEphysZmqReader
@@ -64,6 +70,88 @@ def test_continuous_data_format():
     assert np.array_equal(data_2, data)
 
 
+def test_continuous_data_format_numpy_header_values():
+    data = np.arange(1000, dtype=np.float32)
+    channel_num = np.int32(41)
+    sample_num = np.int64(42)
+    sample_rate = np.float64(1000.42)
+    parts = format_continuous_data(
+        data,
+        "Test",
+        channel_num,
+        sample_num,
+        sample_rate
+    )
+    (envelope, header, data_2) = parse_continuous_data(parts)
+    assert envelope == "DATA"
+    assert header["content"]["channel_num"] == channel_num
+    assert header["content"]["sample_num"] == sample_num
+    assert header["content"]["sample_rate"] == sample_rate
+    assert np.array_equal(data_2, data)
+
+
+def test_continuous_data_format_into_out():
+    num_samples = 100
+    data = np.arange(num_samples, dtype=np.float32)
+    parts = format_continuous_data(data, "Test", 42, 42, 1000)
+
+    # Parse directly into a preallocated, writable column.
+    out = np.empty([num_samples, 1], dtype=np.float32)
+    (envelope, header, data_2) = parse_continuous_data(parts, out=out)
+    assert envelope == "DATA"
+    assert header["content"]["num_samples"] == num_samples
+    assert data_2 is out
+    assert np.array_equal(out[:, 0], data)
+
+
+def test_continuous_data_block_format():
+    num_channels = 3
+    num_samples = 100
+    data = np.arange(num_channels * num_samples, dtype=np.float32).reshape([num_channels, num_samples])
+    stream_name = "Test"
+    channel_nums = [7, 41, 42]
+    sample_num = 42
+    sample_rate = 1000
+    message_num = 42
+    timestamp = 424242
+    parts = format_continuous_data_block(
+        data,
+        stream_name,
+        channel_nums,
+        sample_num,
+        sample_rate,
+        message_num,
+        timestamp
+    )
+    (envelope, header, data_2) = parse_continuous_data(parts)
+    assert envelope == "DATA"
+    assert header["message_num"] == message_num
+    assert header["type"] == "data"
+    assert header["content"]["stream"] == stream_name
+    assert header["content"]["channel_nums"] == channel_nums
+    assert header["content"]["sample_num"] == sample_num
+    assert header["content"]["sample_rate"] == sample_rate
+    assert header["content"]["num_samples"] == num_samples
+    assert header["data_size"] == data.size * data.itemsize
+    assert header["timestamp"] == timestamp
+    assert data_2.shape == (num_channels, num_samples)
+    assert np.array_equal(data_2, data)
+
+
+def test_ttl_data_round_trip():
+    event_line = 7
+    event_state = 1
+    ttl_word = 2**40 + 65535
+    data = ttl_data_to_bytes(event_line, event_state, ttl_word)
+
+    # Same wire format as before: line byte, state byte, then the ttl word as 8 big-endian bytes.
+    assert data == bytes([event_line, event_state]) + ttl_word.to_bytes(length=8, byteorder="big")
+    assert ttl_data_from_bytes(data) == (event_line, event_state, ttl_word)
+
+    # Parsing should also work for zero-copy buffers and ignore trailing bytes.
+    assert ttl_data_from_bytes(memoryview(data + b"extra")) == (event_line, event_state, ttl_word)
+
+
 def test_event_format_with_data():
     event_line = 7
     event_state = 1
@@ -211,6 +299,135 @@ def test_spike_format_multiple_channels():
     assert np.array_equal(waveform_2, waveform)
 
 
+def test_peek_data_type():
+    data_parts = format_continuous_data(np.zeros([10], dtype=np.float32), "Test", 0, 0, 1000)
+    assert peek_data_type(data_parts) == "data"
+
+    event_parts = format_event(None, "Test", 42, 3, 0)
+    assert peek_data_type(event_parts) == "event"
+
+    spike_parts = format_spike(np.zeros([10], dtype=np.float32), "Test", 42, "Electrode", 0, 0, [1.0])
+    assert peek_data_type(spike_parts) == "spike"
+
+    # Other JSON encoders may put a space after the colon.
+    assert peek_data_type([b"EVENT", b'{"message_num": 0, "type": "spike"}']) == "spike"
+    assert peek_data_type([b"EVENT", b'{"message_num": 0, "type": "event"}']) == "event"
+
+    # Quoted strings within header values should not fool the peek.
+    tricky_header = json.dumps({"type": "event", "content": {"stream": '"type":"spike"'}}).encode()
+    assert peek_data_type([b"EVENT", tricky_header]) == "event"
+
+    # Unexpected formatting should fall back to a full parse.
+    assert peek_data_type([b"EVENT", b'{"type"  :  "spike"}']) == "spike"
+    assert peek_data_type([b"OTHER", b'{"type": "other"}']) == "other"
+
+
+def test_spike_format_zero_copy_waveform():
+    waveform = np.random.rand(4, 40).astype(np.float32)
+    parts = format_spike(waveform, "Test", 42, "Electrode", 43, 7, [1.0] * 4)
+
+    # Parse from a read-only buffer, like a received ZMQ frame.
+    payload = memoryview(waveform.tobytes())
+    (envelope, header, waveform_2) = parse_spike(parts[0:2] + [payload])
+    assert waveform_2.shape == (4, 40)
+    assert np.array_equal(waveform_2, waveform)
+    assert np.shares_memory(waveform_2, np.frombuffer(payload, dtype=np.float32))
+
+    # Infer num_samples from the payload size, if the header doesn't say.
+    header_info = json.loads(parts[1])
+    del header_info["spike"]["num_samples"]
+    (envelope, header, waveform_3) = parse_spike([parts[0], json.dumps(header_info).encode(), payload])
+    assert np.array_equal(waveform_3, waveform)
+
+
+def test_parse_message():
+    data = np.random.rand(100).astype(np.float32)
+    results = parse_message(format_continuous_data(data, "Test", 42, 43, 1000))
+    assert results["envelope"] == "DATA"
+    assert results["type"] == "data"
+    assert results["content"]["channel_num"] == 42
+    assert np.array_equal(results["data"], data)
+
+    ttl_data = ttl_data_to_bytes(7, 1, 65535)
+    results = parse_message(format_event(ttl_data, "Test", 42, 3, 43))
+    assert results["envelope"] == "EVENT"
+    assert results["type"] == "event"
+    assert results["content"]["sample_num"] == 43
+    assert results["event_line"] == 7
+    assert results["event_state"] == 1
+    assert results["ttl_word"] == 65535
+
+    # Pyramid only uses ttl events, so ignores other event types.
+    assert parse_message(format_event(None, "Test", 42, 0, 43)) == {}
+
+    waveform = np.random.rand(2, 100).astype(np.float32)
+    results = parse_message(format_spike(waveform, "Test", 42, "Electrode", 43, 7, [1.0, 1.0]))
+    assert results["envelope"] == "EVENT"
+    assert results["type"] == "spike"
+    assert results["spike"]["sorted_id"] == 7
+    assert np.array_equal(results["waveform"], waveform)
+
+
+def test_binary_event_header_format():
+    ttl_data = ttl_data_to_bytes(7, 1, 65535)
+    sample_num = 2**40
+    parts = format_event(ttl_data, "Test", 42, 3, sample_num, 44, 424242, header_format="binary")
+    assert parts[0] == b"EVTB"
+    assert peek_data_type(parts) == "event"
+
+    # Binary headers should parse into the same dictionary as JSON headers.
+    (envelope, header, ttl_data_2) = parse_event(parts)
+    json_parts = format_event(ttl_data, "Test", 42, 3, sample_num, 44, 424242)
+    (json_envelope, json_header, json_ttl_data) = parse_event(json_parts)
+    assert envelope == "EVTB"
+    assert header == json_header
+    assert ttl_data_2 == ttl_data
+
+    results = parse_message(parts)
+    assert results["ttl_word"] == 65535
+    assert results["content"]["sample_num"] == sample_num
+
+    # Events without data should work too.
+    (envelope, header, data) = parse_event(format_event(None, "Test", 42, 3, 43, header_format="binary"))
+    assert header["data_size"] == 0
+    assert data is None
+
+
+def test_msgpack_header_formats():
+    importorskip("msgpack")
+
+    data = np.random.rand(100).astype(np.float32)
+    data_parts = format_continuous_data(data, "Test", 42, np.int64(43), 1000, header_format="msgpack")
+    assert data_parts[0] == b"DATAM"
+    assert peek_data_type(data_parts) == "data"
+    (envelope, header, data_2) = parse_continuous_data(data_parts)
+    assert envelope == "DATAM"
+    assert header["type"] == "data"
+    assert header["content"]["channel_num"] == 42
+    assert header["content"]["sample_num"] == 43
+    assert np.array_equal(data_2, data)
+
+    ttl_data = ttl_data_to_bytes(7, 1, 65535)
+    event_parts = format_event(ttl_data, "Test", 42, 3, 43, header_format="msgpack")
+    assert event_parts[0] == b"EVENTM"
+    assert peek_data_type(event_parts) == "event"
+    (envelope, header, ttl_data_2) = parse_event(event_parts)
+    assert envelope == "EVENTM"
+    assert header["type"] == "event"
+    assert header["content"]["sample_num"] == 43
+    assert ttl_data_2 == ttl_data
+
+    waveform = np.random.rand(2, 100).astype(np.float32)
+    spike_parts = format_spike(waveform, "Test", 42, "Electrode", 43, 7, [1.0, 1.0], header_format="msgpack")
+    assert spike_parts[0] == b"EVENTM"
+    assert peek_data_type(spike_parts) == "spike"
+    (envelope, header, waveform_2) = parse_spike(spike_parts)
+    assert envelope == "EVENTM"
+    assert header["type"] == "spike"
+    assert header["spike"]["electrode"] == "Electrode"
+    assert np.array_equal(waveform_2, waveform)
+
+
 def test_open_ephys_zmq_heartbeats():
     host = "127.0.0.1"
     data_port = 10001
@@ -490,6 +707,150 @@ def test_open_ephys_zmq_mixed_data():
                 assert client.poll_and_receive_heartbeat() is None
 
 
+def test_open_ephys_zmq_deprecated_encoding(caplog):
+    host = "127.0.0.1"
+    data_port = 10001
+    with OpenEphysZmqServer(host=host, data_port=data_port, encoding="UTF-8"):
+        assert not caplog.records
+
+    with OpenEphysZmqReader(host=host, data_port=data_port, encoding="latin-1"):
+        assert "ignoring deprecated encoding latin-1" in caplog.text
+
+
+def test_open_ephys_zmq_high_water_marks():
+    host = "127.0.0.1"
+    data_port = 10001
+    with OpenEphysZmqServer(host=host, data_port=data_port, send_high_water_mark=42) as server:
+        assert server.data_socket.getsockopt(zmq.SNDHWM) == 42
+
+    with OpenEphysZmqReader(host=host, data_port=data_port, receive_high_water_mark=43) as reader:
+        assert reader.client.data_socket.getsockopt(zmq.RCVHWM) == 43
+
+
+def test_open_ephys_zmq_combined_poll():
+    host = "127.0.0.1"
+    data_port = 10001
+    hearbeat_port = data_port + 1
+    with OpenEphysZmqServer(host=host, data_port=data_port, heartbeat_port=hearbeat_port, timeout_ms=100) as server:
+        with OpenEphysZmqClient(host=host, data_port=data_port, heartbeat_port=hearbeat_port) as client:
+            # Nothing to receive yet.
+            ready = client.poll_combined()
+            assert ready == {}
+            assert client.poll_and_receive_heartbeat(ready=ready) is None
+            assert client.poll_and_receive_data(ready=ready) == {}
+
+            # Set up a heartbeat reply and some data for the client to consume.
+            assert client.send_heartbeat() is True
+            assert server.poll_heartbeat_and_reply() is True
+            while not client.poll_and_receive_data(timeout_ms=10):
+                server.send_ttl_event(0, 1, 0, "test_stream", 42, sample_num=0)
+            while client.poll_and_receive_data(timeout_ms=10):
+                pass
+            server.send_ttl_event(0, 1, 0, "test_stream", 42, sample_num=1)
+            time.sleep(0.1)
+
+            # One poll should see both sockets ready.
+            ready = client.poll_combined()
+            assert client.heartbeat_socket in ready
+            assert client.data_socket in ready
+            assert client.poll_and_receive_heartbeat(ready=ready) == server.heartbeat_reply
+            assert client.poll_and_receive_data(ready=ready)["content"]["sample_num"] == 1
+
+
+def test_open_ephys_zmq_receive_in_background():
+    host = "127.0.0.1"
+    data_port = 10001
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=100) as server:
+        with OpenEphysZmqClient(host=host, data_port=data_port, receive_in_background=True) as client:
+            assert client.receive_thread.is_alive()
+
+            # It should be safe to poll when there's no data available yet.
+            assert client.poll_and_receive_data() == {}
+
+            # Wait for a first message to arrive, since the server may be sending before the client is subscribed.
+            while not client.poll_and_receive_data(timeout_ms=10):
+                server.send_ttl_event(event_line=0, event_state=1, ttl_word=0, stream_name="test_stream", source_node=42, sample_num=-1)
+            while client.poll_and_receive_data(timeout_ms=10):
+                pass
+
+            # Send mixed bunches of data for the background thread to queue up.
+            for index in range(0, 10):
+                server.send_continuous_data(
+                    data=np.random.rand(100).astype(np.float32),
+                    stream_name="test_stream",
+                    channel_num=42,
+                    sample_num=index * 100,
+                    sample_rate=1000.42
+                )
+                server.send_ttl_event(
+                    event_line=np.random.randint(0, 255),
+                    event_state=np.random.randint(0, 1),
+                    ttl_word=np.random.randint(0, 1e6),
+                    stream_name="test_stream",
+                    source_node=42,
+                    sample_num=index
+                )
+
+            # Let the client receive the queued data in the order sent.
+            for index in range(0, 10):
+                results = client.poll_and_receive_data(timeout_ms=100)
+                assert results["type"] == "data"
+                assert results["content"]["sample_num"] == index * 100
+
+                results = client.poll_and_receive_data(timeout_ms=100)
+                assert results["type"] == "event"
+                assert results["content"]["sample_num"] == index
+
+            assert client.poll_and_receive_data() == {}
+            assert client.dropped_message_count == 0
+
+            receive_thread = client.receive_thread
+
+    # Exiting should stop the background thread.
+    assert not receive_thread.is_alive()
+    assert client.receive_thread is None
+
+
+def test_open_ephys_zmq_receive_in_background_drops_oldest(caplog):
+    host = "127.0.0.1"
+    data_port = 10001
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=100) as server:
+        with OpenEphysZmqClient(
+            host=host,
+            data_port=data_port,
+            receive_in_background=True,
+            max_queued_messages=2
+        ) as client:
+            # Wait for a first message to arrive, since the server may be sending before the client is subscribed.
+            while not client.poll_and_receive_data(timeout_ms=10):
+                server.send_ttl_event(event_line=0, event_state=1, ttl_word=0, stream_name="test_stream", source_node=42, sample_num=0)
+            while client.poll_and_receive_data(timeout_ms=10):
+                pass
+            client.dropped_message_count = 0
+            caplog.clear()
+
+            # Send more events than the client will queue up.
+            for index in range(1, 6):
+                server.send_ttl_event(
+                    event_line=0,
+                    event_state=1,
+                    ttl_word=index,
+                    stream_name="test_stream",
+                    source_node=42,
+                    sample_num=index
+                )
+            time.sleep(0.1)
+
+            # Expect just the last two events, with the rest dropped.
+            assert client.poll_and_receive_data(timeout_ms=100)["content"]["sample_num"] == 4
+            assert client.poll_and_receive_data(timeout_ms=100)["content"]["sample_num"] == 5
+            assert client.poll_and_receive_data() == {}
+            assert client.dropped_message_count == 3
+
+            # Expect one warning for the whole burst of drops, not one per dropped message.
+            assert len([record for record in caplog.records if "dropping messages" in record.getMessage()]) == 1
+
+
 def test_open_ephys_zmq_reader_heartbeat():
     host = "127.0.0.1"
     data_port = 10001
@@ -718,6 +1079,265 @@ def test_open_ephys_zmq_reader_selected_data_and_spikes():
             assert not reader.read_next()
 
 
+def test_open_ephys_zmq_reader_continuous_data_block():
+    host = "127.0.0.1"
+    data_port = 10001
+    continuous_data = {0: "zero", 42: "forty_two"}
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data=continuous_data,
+            timeout_ms=timeout_ms
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # See one block of continuous data end up as
+            #  - channel 0 -> buffer "zero"
+            #  - channel 42 -> buffer "forty_two"
+            #  - channel 7 -> ignored
+            block_data = np.random.rand(3, 100).astype(np.float32)
+            server.send_continuous_data_block(
+                data=block_data,
+                stream_name="test_stream",
+                channel_nums=[0, 7, 42],
+                sample_num=42,
+                sample_rate=1000
+            )
+            assert reader.read_next() == {
+                "zero": SignalChunk(
+                    sample_data=block_data[0].reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=42 / 1000,
+                    channel_ids=[0]
+                ),
+                "forty_two": SignalChunk(
+                    sample_data=block_data[2].reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=42 / 1000,
+                    channel_ids=[42]
+                )
+            }
+            assert not reader.read_next()
+
+
+def test_open_ephys_zmq_reader_multiple_messages_per_read():
+    host = "127.0.0.1"
+    data_port = 10001
+    event_sample_frequency = 1000
+    continuous_data = {42: "forty_two"}
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data=continuous_data,
+            events="events",
+            spikes="spikes",
+            event_sample_frequency=event_sample_frequency,
+            timeout_ms=timeout_ms,
+            max_messages_per_read=10
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # Send a burst of messages, for the reader to combine into one result.
+            data_0 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_0, "test_stream", 42, sample_num=1000, sample_rate=1000)
+            server.send_ttl_event(123, 1, 123456789, "test_stream", 42, sample_num=0)
+            server.send_spike(np.random.rand(2, 100).astype(np.float32), "test_stream", 42, "electrode_1", 0, 7, [1, 1])
+            data_1 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_1, "test_stream", 42, sample_num=1100, sample_rate=1000)
+            server.send_ttl_event(123, 0, 987654321, "test_stream", 42, sample_num=1)
+            server.send_spike(np.random.rand(2, 100).astype(np.float32), "test_stream", 42, "electrode_2", 100, 8, [1, 1])
+            time.sleep(0.1)
+
+            assert reader.read_next() == {
+                "forty_two": SignalChunk(
+                    sample_data=np.concatenate([data_0, data_1]).reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=1.0,
+                    channel_ids=[42]
+                ),
+                # [timestamp, ttl_word, event_line, event_state]
+                "events": NumericEventList(np.array([
+                    [0 / event_sample_frequency, 123456789, 123, 1],
+                    [1 / event_sample_frequency, 987654321, 123, 0]
+                ])),
+                # [timestamp, sorted_id]
+                "spikes": NumericEventList(np.array([
+                    [0 / event_sample_frequency, 7],
+                    [100 / event_sample_frequency, 8]
+                ]))
+            }
+            assert not reader.read_next()
+
+
+def test_open_ephys_zmq_reader_multiple_messages_with_gap():
+    host = "127.0.0.1"
+    data_port = 10001
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data={42: "forty_two"},
+            timeout_ms=timeout_ms,
+            max_messages_per_read=10
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # Send a burst of messages, as if one in the middle was dropped.
+            data_0 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_0, "test_stream", 42, sample_num=1000, sample_rate=1000)
+            data_1 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_1, "test_stream", 42, sample_num=1100, sample_rate=1000)
+            data_3 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_3, "test_stream", 42, sample_num=1300, sample_rate=1000)
+            data_4 = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data_4, "test_stream", 42, sample_num=1400, sample_rate=1000)
+            time.sleep(0.1)
+
+            # Chunks before the gap should combine, keeping their own start time.
+            assert reader.read_next() == {
+                "forty_two": SignalChunk(
+                    sample_data=np.concatenate([data_0, data_1]).reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=1.0,
+                    channel_ids=[42]
+                )
+            }
+
+            # Chunks after the gap should come next, with their own start time.
+            assert reader.read_next() == {
+                "forty_two": SignalChunk(
+                    sample_data=np.concatenate([data_3, data_4]).reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=1.3,
+                    channel_ids=[42]
+                )
+            }
+            assert not reader.read_next()
+
+
+def test_open_ephys_zmq_reader_ring_buffer():
+    host = "127.0.0.1"
+    data_port = 10001
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data={42: "forty_two"},
+            timeout_ms=timeout_ms,
+            ring_buffer_samples=250
+        ) as reader:
+            ring = reader.sample_rings["forty_two"]
+            assert ring.shape == (250, 1)
+
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # Each chunk should land in the next region of the ring, wrapping around when there's not enough room.
+            for index, expected_cursor in enumerate([0, 100, 0, 100]):
+                data = np.random.rand(100).astype(np.float32)
+                server.send_continuous_data(data, "test_stream", 42, sample_num=index * 100, sample_rate=1000)
+                results = reader.read_next()
+                assert results == {
+                    "forty_two": SignalChunk(
+                        sample_data=data.reshape([-1, 1]),
+                        sample_frequency=1000,
+                        first_sample_time=index * 100 / 1000,
+                        channel_ids=[42]
+                    )
+                }
+                sample_data = results["forty_two"].sample_data
+                assert np.shares_memory(sample_data, ring)
+                assert np.array_equal(ring[expected_cursor:expected_cursor + 100, 0], data)
+
+            # Chunks too big for the ring should still come through, just not in the ring.
+            data = np.random.rand(300).astype(np.float32)
+            server.send_continuous_data(data, "test_stream", 42, sample_num=400, sample_rate=1000)
+            results = reader.read_next()
+            sample_data = results["forty_two"].sample_data
+            assert np.array_equal(sample_data[:, 0], data)
+            assert not np.shares_memory(sample_data, ring)
+
+
+def test_open_ephys_zmq_reader_msgpack_headers():
+    importorskip("msgpack")
+
+    host = "127.0.0.1"
+    data_port = 10001
+    event_sample_frequency = 1000
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms, header_format="msgpack") as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data={42: "forty_two"},
+            events="events",
+            spikes="spikes",
+            event_sample_frequency=event_sample_frequency,
+            timeout_ms=timeout_ms
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            data = np.random.rand(100).astype(np.float32)
+            server.send_continuous_data(data, "test_stream", 42, sample_num=1000, sample_rate=1000)
+            assert reader.read_next() == {
+                "forty_two": SignalChunk(
+                    sample_data=data.reshape([-1, 1]),
+                    sample_frequency=1000,
+                    first_sample_time=1.0,
+                    channel_ids=[42]
+                )
+            }
+
+            server.send_ttl_event(123, 1, 123456789, "test_stream", 42, sample_num=0)
+            assert reader.read_next() == {
+                "events": NumericEventList(np.array([[0 / event_sample_frequency, 123456789, 123, 1]]))
+            }
+
+            server.send_spike(np.random.rand(2, 100).astype(np.float32), "test_stream", 42, "electrode_1", 100, 7, [1, 1])
+            assert reader.read_next() == {
+                "spikes": NumericEventList(np.array([[100 / event_sample_frequency, 7]]))
+            }
+
+
+def test_open_ephys_zmq_reader_binary_event_headers():
+    host = "127.0.0.1"
+    data_port = 10001
+    event_sample_frequency = 1000
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms, header_format="binary") as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            events="events",
+            spikes="spikes",
+            event_sample_frequency=event_sample_frequency,
+            timeout_ms=timeout_ms
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            server.send_ttl_event(123, 1, 123456789, "test_stream", 42, sample_num=0)
+            assert reader.read_next() == {
+                "events": NumericEventList(np.array([[0 / event_sample_frequency, 123456789, 123, 1]]))
+            }
+
+            # Spikes still use JSON headers.
+            server.send_spike(np.random.rand(2, 100).astype(np.float32), "test_stream", 42, "electrode_1", 100, 7, [1, 1])
+            assert reader.read_next() == {
+                "spikes": NumericEventList(np.array([[100 / event_sample_frequency, 7]]))
+            }
+
+
 def test_open_ephys_zmq_no_linger_for_unsent_messages():
     host = "127.0.0.1"
     data_port = 10001
@@ -1,10 +1,11 @@
 from pathlib import Path
 
-from pytest import fixture, raises
+from pytest import fixture, raises, mark, importorskip
 import numpy as np
 
 from pyramid.file_finder import FileFinder
 from pyramid.model.events import NumericEventList
+from pyramid.neutral_zone.readers import phy
 from pyramid.neutral_zone.readers.phy import PhyClusterEventReader
 
 
@@ -27,7 +28,8 @@ def test_gold_phy(fixture_path):
         # By default, keep all clusters in the file.
         assert reader.clusters_to_keep == None
 
-        # Expect 510863 [time, cluster] events in this file.
+        # Expect 510863 [time, cluster] events in this file, read in large increments.
+        read_count = 0
         spike_count = 0
         while reader.current_row < reader.spikes_times.size:
             result = reader.read_next()
@@ -35,8 +37,10 @@ def test_gold_phy(fixture_path):
             spikes = result["spikes"]
             assert spikes.values_per_event() == 1
             spike_count += spikes.event_count()
+            read_count += 1
         assert reader.current_row == 510863
         assert spike_count == 510863
+        assert read_count == 2
 
         with raises(StopIteration) as exception_info:
             reader.read_next()
@@ -63,6 +67,9 @@ def test_gold_phy_reasonable_filter(fixture_path):
     with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
         # Expect some but not all clusters and spikes for this reasonable filter.
         assert reader.clusters_to_keep == [5, 6]
+
+        # Expect a lookup mask for kept clusters, with a trailing False for cluster ids beyond those.
+        assert reader.cluster_keep_mask.tolist() == [False, False, False, False, False, True, True, False]
         spike_count = 0
         while reader.current_row < reader.spikes_times.size:
             result = reader.read_next()
@@ -78,6 +85,7 @@ def test_gold_phy_harsh_filter(fixture_path):
     with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
         # Expect no clusters or spikes for this harsh filter.
         assert reader.clusters_to_keep == []
+        assert reader.cluster_keep_mask.tolist() == [False]
         while reader.current_row < reader.spikes_times.size:
             result = reader.read_next()
             assert result is None
@@ -147,3 +155,308 @@ def test_phy_data_master_invalid_filter(fixture_path):
         while reader.current_row < reader.spikes_times.size:
             result = reader.read_next()
             assert result is None
+
+
+def test_phy_1d_arrays(tmp_path):
+    # Some versions of Phy and Kilosort save spike times and clusters as 1D arrays, instead of 2D with one column.
+    Path(tmp_path, 'params.py').write_text("sample_rate = 1000.\n")
+    np.save(Path(tmp_path, 'spike_times.npy'), np.array([10, 20, 30, 40, 50], dtype=np.uint64))
+    np.save(Path(tmp_path, 'spike_clusters.npy'), np.array([0, 1, 2, 1, 0], dtype=np.uint32))
+    Path(tmp_path, 'cluster_group.tsv').write_text("cluster_id\tgroup\n0\tgood\n1\tmua\n2\tgood\n")
+
+    params_file = Path(tmp_path, 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), rows_per_read=3) as reader:
+        assert reader.read_next() == {
+            "spikes": NumericEventList(np.array([[0.01, 0], [0.02, 1], [0.03, 2]]))
+        }
+        assert reader.read_next() == {
+            "spikes": NumericEventList(np.array([[0.04, 1], [0.05, 0]]))
+        }
+
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="group == 'good'", rows_per_read=3) as reader:
+        assert reader.clusters_to_keep == [0, 2]
+        assert reader.read_next() == {
+            "spikes": NumericEventList(np.array([[0.01, 0], [0.03, 2]]))
+        }
+        assert reader.read_next() == {
+            "spikes": NumericEventList(np.array([[0.05, 0]]))
+        }
+
+
+def test_phy_params_file_with_comments(tmp_path):
+    Path(tmp_path, 'params.py').write_text(
+        "# Phy params, with comments and blank lines.\n"
+        "\n"
+        "dat_path = 'data.dat'\n"
+        "sample_rate = 30000.  # Hz\n"
+        "sample_rate = 'ignored after the first one'\n"
+    )
+    np.save(Path(tmp_path, 'spike_times.npy'), np.array([30000], dtype=np.uint64))
+    np.save(Path(tmp_path, 'spike_clusters.npy'), np.array([0], dtype=np.uint32))
+
+    params_file = Path(tmp_path, 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder()) as reader:
+        assert reader.sample_rate == 30000
+        assert reader.read_next() == {
+            "spikes": NumericEventList(np.array([[1.0, 0]]))
+        }
+
+
+@mark.parametrize(
+    "filter_expression,clusters_to_keep",
+    [
+        ("True", [0, 1, 2, 3, 4, 5, 6, 7]),
+        ("False", []),
+        ("Amplitude > 5000", [5, 6]),
+        ("ContamPct < 100", []),
+        ("KSLabel == 'mua' and Amplitude < 4000", [1, 2]),
+        ("KSLabel.startswith('m') and cluster_id > 6", [7]),
+        ("invalid=='no way'", []),
+    ]
+)
+def test_gold_phy_filters_with_and_without_pandas(fixture_path, monkeypatch, filter_expression, clusters_to_keep):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        assert sorted(reader.clusters_to_keep) == clusters_to_keep
+
+    # The csv module fallback, which may use numexpr, should agree with pandas.
+    monkeypatch.setattr(phy, "pd", None)
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        assert sorted(reader.clusters_to_keep) == clusters_to_keep
+
+    # The pure-Python fallback should agree, too.
+    monkeypatch.setattr(phy, "numexpr", None)
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        assert sorted(reader.clusters_to_keep) == clusters_to_keep
+
+
+def test_filter_cluster_columns_with_numexpr(fixture_path):
+    importorskip("numexpr")
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    reader = PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000")
+    cluster_info = reader.read_cluster_info()
+
+    # Numeric expressions are evaluated for all clusters at once.
+    assert reader.filter_cluster_columns(cluster_info) == [5, 6]
+
+    # Expressions numexpr can't handle, like those using string columns, are left for Python to evaluate.
+    reader.cluster_filter = "KSLabel == 'mua'"
+    assert reader.filter_cluster_columns(cluster_info) is None
+
+
+def test_gold_phy_filter_with_and_without_numba(fixture_path, monkeypatch):
+    importorskip("numba")
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000") as reader:
+        compiled_results = [reader.read_next()["spikes"].copy() for _ in range(2)]
+
+    # The NumPy fallback should agree exactly with the compiled kernel.
+    monkeypatch.setattr(phy, "njit", None)
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000") as reader:
+        numpy_results = [reader.read_next()["spikes"].copy() for _ in range(2)]
+
+    assert compiled_results == numpy_results
+    assert sum(result.event_count() for result in compiled_results) == 31220
+
+
+def test_advise_memmap(tmp_path):
+    array_file = Path(tmp_path, 'array.npy')
+    np.save(array_file, np.arange(10))
+    memory_mapped = np.load(array_file, mmap_mode="r")
+
+    # Advice is a hint, so it shouldn't change data or fail for arrays, advice, or platforms that don't support it.
+    phy.advise_memmap(memory_mapped, "MADV_SEQUENTIAL")
+    phy.advise_memmap(memory_mapped, "MADV_NO_SUCH_ADVICE")
+    phy.advise_memmap(np.arange(10), "MADV_SEQUENTIAL")
+    phy.advise_memmap(None, "MADV_DONTNEED")
+    assert memory_mapped.tolist() == list(range(10))
+
+
+def test_gold_phy_with_and_without_memmap(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000") as reader:
+        memmap_results = [reader.read_next()["spikes"].copy() for _ in range(2)]
+
+    # Reading with ordinary file reads should agree with memory-mapped reads.
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000", use_memmap=False) as reader:
+        assert isinstance(reader.spikes_times, phy.NpyFileReader)
+        assert reader.spikes_times.size == 510863
+        file_results = [reader.read_next()["spikes"].copy() for _ in range(2)]
+        with raises(StopIteration):
+            reader.read_next()
+
+    assert file_results == memmap_results
+
+
+def test_npy_file_reader(tmp_path):
+    array_file = Path(tmp_path, 'array.npy')
+    array = np.arange(20, dtype=np.uint32).reshape([10, 2])
+    np.save(array_file, array)
+
+    npy_file_reader = phy.NpyFileReader(array_file)
+    assert npy_file_reader.shape == (10, 2)
+    assert npy_file_reader.dtype == np.uint32
+    assert npy_file_reader.size == 20
+    assert np.array_equal(npy_file_reader[0:3], array[0:3])
+    assert np.array_equal(npy_file_reader[7:15], array[7:10])
+    assert npy_file_reader[10:12].shape == (0, 2)
+    npy_file_reader.close()
+
+
+def test_filter_cluster_info_errors(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    reader = PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000")
+    (_, filter_names) = reader.compile_cluster_filter()
+    assert filter_names == {"Amplitude"}
+
+    # Expected errors, like comparing strings to numbers, mean "don't keep this cluster".
+    cluster_info = {0: {"Amplitude": "big"}, 1: {"Amplitude": 6000.0}, 2: {}}
+    assert reader.filter_cluster_info(cluster_info) == [1]
+
+    # Other errors are likely bugs in the filter expression, so don't hide them.
+    reader.cluster_filter = "{}['Amplitude'] > 5000"
+    with raises(KeyError):
+        reader.filter_cluster_info(cluster_info)
+
+
+def test_phy_event_buffer_rotation(tmp_path):
+    Path(tmp_path, 'params.py').write_text("sample_rate = 1000.\n")
+    np.save(Path(tmp_path, 'spike_times.npy'), np.arange(10, 70, 10, dtype=np.uint64))
+    np.save(Path(tmp_path, 'spike_clusters.npy'), np.arange(6, dtype=np.uint32))
+
+    params_file = Path(tmp_path, 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), rows_per_read=2, event_buffer_count=2) as reader:
+        # Consecutive results use different buffers, so the first stays valid while the second is read.
+        first = reader.read_next()["spikes"]
+        second = reader.read_next()["spikes"]
+        assert first == NumericEventList(np.array([[0.01, 0], [0.02, 1]]))
+        assert second == NumericEventList(np.array([[0.03, 2], [0.04, 3]]))
+        assert not np.shares_memory(first.event_data, second.event_data)
+
+        # After event_buffer_count reads, buffers get reused.
+        third = reader.read_next()["spikes"]
+        assert third == NumericEventList(np.array([[0.05, 4], [0.06, 5]]))
+        assert np.shares_memory(first.event_data, third.event_data)
+
+
+def test_gold_phy_reenter(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    reader = PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000")
+    assert [cluster_file.name for cluster_file in reader.cluster_files] == sorted(
+        cluster_file.name for cluster_file in reader.cluster_files
+    )
+
+    # Cluster files should be available each time we enter the reader, not just the first.
+    for _ in range(2):
+        with reader:
+            assert reader.clusters_to_keep == [5, 6]
+
+
+@mark.parametrize("clusters_to_keep", [[], [3], [0, 2, 5], list(range(9)), list(range(0, 20, 2))])
+def test_select_clusters(fixture_path, clusters_to_keep):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    reader = PhyClusterEventReader(params_file, FileFinder())
+    reader.clusters_to_keep = clusters_to_keep
+    reader.cluster_keep_mask = np.zeros([max(clusters_to_keep, default=-1) + 2], dtype=np.bool_)
+    reader.cluster_keep_mask[clusters_to_keep] = True
+
+    # Comparing ids directly, for a few clusters, and looking them up in the mask should agree.
+    clusters = np.arange(25, dtype=np.uint32)
+    assert np.array_equal(reader.select_clusters(clusters), np.isin(clusters, clusters_to_keep))
+
+
+@mark.parametrize("use_memmap", [True, False])
+@mark.parametrize("filter_expression", ["Amplitude > 5000", "ContamPct < 100"])
+def test_gold_phy_index_kept_rows(fixture_path, use_memmap, filter_expression):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        filtered_events = []
+        while reader.current_row < reader.spikes_times.size:
+            result = reader.read_next()
+            if result:
+                filtered_events.append(result["spikes"].event_data.copy())
+
+    # Reading rows found up front should agree with filtering each increment.
+    with PhyClusterEventReader(
+        params_file,
+        FileFinder(),
+        cluster_filter=filter_expression,
+        use_memmap=use_memmap,
+        index_kept_rows=True,
+        rows_per_read=10000
+    ) as reader:
+        indexed_events = []
+        while reader.current_row < reader.spikes_times.size:
+            result = reader.read_next()
+            if result:
+                indexed_events.append(result["spikes"].event_data.copy())
+        with raises(StopIteration):
+            reader.read_next()
+
+    assert np.array_equal(np.concatenate(indexed_events or [np.empty([0, 2])]), np.concatenate(filtered_events or [np.empty([0, 2])]))
+
+
+def test_gold_phy_index_kept_rows_bounded_reads(fixture_path, monkeypatch):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="Amplitude > 5000") as reader:
+        expected_events = []
+        while reader.current_row < reader.spikes_times.size:
+            result = reader.read_next()
+            if result:
+                expected_events.append(result["spikes"].event_data.copy())
+
+    # Spy on ordinary file reads, to check how many rows each one spans.
+    read_sizes = []
+    original_getitem = phy.NpyFileReader.__getitem__
+
+    def spy_getitem(self, rows: slice) -> np.ndarray:
+        data = original_getitem(self, rows)
+        read_sizes.append(data.shape[0])
+        return data
+
+    monkeypatch.setattr(phy.NpyFileReader, "__getitem__", spy_getitem)
+
+    # Reads of sparse kept rows should span no more than rows_per_read rows of the file.
+    rows_per_read = 100
+    with PhyClusterEventReader(
+        params_file,
+        FileFinder(),
+        cluster_filter="Amplitude > 5000",
+        use_memmap=False,
+        index_kept_rows=True,
+        rows_per_read=rows_per_read
+    ) as reader:
+        indexed_events = []
+        read_sizes.clear()
+        while reader.current_row < reader.spikes_times.size:
+            result = reader.read_next()
+            if result:
+                indexed_events.append(result["spikes"].event_data.copy())
+
+    assert read_sizes
+    assert max(read_sizes) <= rows_per_read
+    assert np.array_equal(np.concatenate(indexed_events), np.concatenate(expected_events))
+
+
+def test_advise_file(tmp_path):
+    array_file = Path(tmp_path, 'array.npy')
+    np.save(array_file, np.arange(10))
+
+    # Advice is a hint, so it shouldn't change data or fail for advice or platforms that don't support it.
+    with open(array_file, 'rb') as f:
+        phy.advise_file(f, "POSIX_FADV_SEQUENTIAL")
+        phy.advise_file(f, "POSIX_FADV_NO_SUCH_ADVICE")
+        assert np.array_equal(np.load(f), np.arange(10))
+
+
+def test_gold_phy_read_increment_choice(fixture_path, monkeypatch):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    with PhyClusterEventReader(params_file, FileFinder()) as reader:
+        assert reader.read_increment == reader.read_next_all_clusters
+
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="True", index_kept_rows=True) as reader:
+        assert reader.read_increment == reader.read_next_kept_rows
+
+    monkeypatch.setattr(phy, "njit", None)
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter="True") as reader:
+        assert reader.read_increment == reader.read_next_selected_clusters
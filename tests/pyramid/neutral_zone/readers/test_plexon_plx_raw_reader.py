@@ -3,8 +3,9 @@ from pathlib import Path
 import json
 import numpy as np
 
-from pytest import fixture
+from pytest import fixture, importorskip
 
+from pyramid.neutral_zone.readers import plexon
 from pyramid.neutral_zone.readers.plexon import PlexonPlxRawReader
 
 
@@ -304,3 +305,111 @@ def test_waveform_freq_zero(fixture_path):
         assert raw_reader.global_header["WaveformFreq"] == 0
         all_blocks = read_all_blocks(raw_reader)
         assert_sequential_block_timestamps(all_blocks)
+
+
+def test_block_index(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        # Expect to find all the blocks up front, without consuming them yet.
+        assert raw_reader.block_count == 0
+        assert raw_reader.block_offsets.size == 52084
+        assert raw_reader.block_headers.shape == (52084,)
+        assert set(np.unique(raw_reader.block_headers['Type'])) == {1, 4, 5}
+
+        # The last block should end right at the end of the file.
+        last_header = raw_reader.block_headers[-1]
+        last_block_size = 16 + 2 * int(last_header['NumberOfWaveforms']) * int(last_header['NumberOfWordsInWaveform'])
+        assert raw_reader.block_offsets[-1] + last_block_size == plx_file.stat().st_size
+
+        all_blocks = read_all_blocks(raw_reader)
+        assert raw_reader.block_count == 52084
+        assert sum(len(blocks) for channel_blocks in all_blocks.values() for blocks in channel_blocks.values()) == 52084
+        assert raw_reader.next_block() is None
+
+        # As we read, the reader should let the OS drop pages it has already read.
+        assert 0 < raw_reader.released_offset < plx_file.stat().st_size
+
+    assert raw_reader.plx_map is None
+
+
+def test_raw_waveforms_from_memory_map(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as scaled_reader:
+        scaled_blocks = [scaled_reader.next_block() for _ in range(1000)]
+
+    with PlexonPlxRawReader(plx_file, scale_waveforms=False) as raw_reader:
+        raw_blocks = [raw_reader.next_block() for _ in range(1000)]
+
+    # Raw waveforms are int16 views of the file which stay valid even after the reader closes.
+    for raw_block, scaled_block in zip(raw_blocks, scaled_blocks):
+        if "waveforms" in raw_block:
+            assert raw_block["waveforms"].dtype == np.int16
+            assert not raw_block["waveforms"].flags.writeable
+            if raw_block["type"] == 5:
+                gain = raw_reader.gain_per_slow_channel[raw_block["channel"]]
+            else:
+                gain = raw_reader.gain_per_dsp_channel[raw_block["channel"]]
+            assert np.array_equal(raw_block["waveforms"] * gain, scaled_block["waveforms"])
+
+
+def test_block_index_with_and_without_numba(fixture_path, monkeypatch):
+    importorskip("numba")
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        compiled_offsets = raw_reader.block_offsets
+        compiled_headers = raw_reader.block_headers
+
+    # The Python fallback should find the same blocks, even when gathering headers in several batches.
+    monkeypatch.setattr(plexon, "njit", None)
+    monkeypatch.setattr(plexon, "blocks_per_header_gather", 1000)
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        python_offsets = raw_reader.block_offsets
+        python_headers = raw_reader.block_headers
+
+    assert compiled_offsets.size == 52084
+    assert np.array_equal(compiled_offsets, python_offsets)
+    assert np.array_equal(compiled_headers, python_headers)
+
+
+def test_headers_only(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file, headers_only=True) as raw_reader:
+        assert len(raw_reader.dsp_channel_headers) == 64
+        assert raw_reader.block_offsets is None
+        assert raw_reader.block_headers is None
+
+
+def test_gain_lookup_tables(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        for gains, channel_headers in [
+            (raw_reader.gain_per_dsp_channel, raw_reader.dsp_channel_headers),
+            (raw_reader.gain_per_slow_channel, raw_reader.slow_channel_headers)
+        ]:
+            # Gains are indexed by channel id, with nan for ids that aren't channels of that type.
+            channel_ids = [header["Channel"] for header in channel_headers]
+            assert gains.size == max(channel_ids) + 1
+            assert np.all(gains[channel_ids] > 0)
+            assert np.count_nonzero(np.isnan(gains)) == gains.size - len(set(channel_ids))
+
+
+def test_channel_header_arrays(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        for header_array, headers in [
+            (raw_reader.dsp_channel_header_array, raw_reader.dsp_channel_headers),
+            (raw_reader.event_channel_header_array, raw_reader.event_channel_headers),
+            (raw_reader.slow_channel_header_array, raw_reader.slow_channel_headers)
+        ]:
+            # Header arrays have the same values as header dicts, but with raw bytes instead of decoded strings.
+            assert header_array.size == len(headers)
+            assert header_array["Channel"].tolist() == [header["Channel"] for header in headers]
+            assert [name.decode("utf8") for name in header_array["Name"]] == [header["Name"] for header in headers]
+
+
+def test_combine_timestamps():
+    upper_bytes = np.array([0, 0, 0, 1, 1, 255], dtype=np.uint16)
+    lower_words = np.array([0, 1, -1, 0, -2 ** 31, -1], dtype=np.int32)
+    timestamps = plexon.combine_timestamps(upper_bytes, lower_words)
+    assert timestamps.dtype == np.int64
+    assert timestamps.tolist() == [0, 1, 2 ** 32 - 1, 2 ** 32, 2 ** 32 + 2 ** 31, 2 ** 40 - 1]
@@ -1,14 +1,16 @@
 from pathlib import Path
 import numpy as np
 
-from pytest import fixture, raises
+from pytest import fixture, raises, mark
 import cProfile
+import pickle
 import pstats
 
 from pyramid.file_finder import FileFinder
 from pyramid.model.events import NumericEventList
 from pyramid.model.signals import SignalChunk
-from pyramid.neutral_zone.readers.plexon import PlexonPlxReader
+from pyramid.neutral_zone.readers import plexon
+from pyramid.neutral_zone.readers.plexon import PlexonPlxReader, PlexonPlxRawReader
 
 
 @fixture
@@ -267,3 +269,88 @@ def test_read_whole_plx_file_aliased_channels_only(fixture_path):
 
         # Calling read_next() and getting StopIteration should do nothing.
         assert reader.raw_reader.block_count == 52084
+
+
+def test_block_names(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    spikes = {"SPK03": "my_spikes"}
+    events = {"Start": "my_start_event"}
+    signals = {"FP07": "my_signal"}
+    with PlexonPlxReader(plx_file, FileFinder(), spikes=spikes, events=events, signals=signals) as reader:
+        block_names = [reader.kept_names[name_id] for name_id in reader.block_name_ids]
+        block_types = reader.raw_reader.block_headers["Type"]
+        block_channels = reader.raw_reader.block_headers["Channel"]
+
+        # Each indexed block should have the name of its channel, if kept, for its block type.
+        assert len(block_names) == 52084
+        assert set(block_names) == {"skip", "my_spikes", "my_start_event", "my_signal"}
+        names_by_type = {
+            1: reader.spike_channel_names,
+            4: reader.event_channel_names,
+            5: reader.signal_channel_names
+        }
+        expected_names = [
+            names_by_type[block_type].get(channel_id, "skip")
+            for block_type, channel_id in zip(block_types, block_channels)
+        ]
+        assert block_names == expected_names
+
+
+def test_pickle_results_out_of_band(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder()) as reader:
+        results = reader.read_next()
+
+    # Pickle protocol 5 can pass contiguous result arrays out-of-band, without copying them into the pickle.
+    buffers = []
+    pickled = pickle.dumps(results, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == len(results)
+    assert pickle.loads(pickled, buffers=buffers) == results
+
+
+def test_block_end_times(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder()) as reader:
+        block_end_times = reader.block_end_times
+
+    # Each block end time should match the end time of data read from that block.
+    expected_end_times = []
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        block = raw_reader.next_block()
+        while block is not None:
+            if block["type"] == 5:
+                signal_chunk = SignalChunk(
+                    sample_data=block["waveforms"].reshape([-1, 1]),
+                    sample_frequency=float(block["frequency"]),
+                    first_sample_time=float(block["timestamp_seconds"]),
+                    channel_ids=[block["channel"]]
+                )
+                expected_end_times.append(signal_chunk.get_end_time())
+            else:
+                expected_end_times.append(block["timestamp_seconds"])
+            block = raw_reader.next_block()
+
+    assert block_end_times.tolist() == expected_end_times
+
+
+def read_all(plx_file: Path, seconds_per_read: float) -> list[dict]:
+    all_results = []
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=seconds_per_read) as reader:
+        while True:
+            try:
+                all_results.append(reader.read_next())
+            except StopIteration:
+                return all_results
+
+
+@mark.parametrize("seconds_per_read", [0.0, 0.001, 0.01, 1.0])
+def test_batch_and_one_at_a_time_reads_agree(fixture_path, monkeypatch, seconds_per_read):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+
+    monkeypatch.setattr(plexon, "min_batch_blocks", 0)
+    batch_results = read_all(plx_file, seconds_per_read)
+
+    monkeypatch.setattr(plexon, "min_batch_blocks", 1e9)
+    one_at_a_time_results = read_all(plx_file, seconds_per_read)
+
+    assert batch_results == one_at_a_time_results
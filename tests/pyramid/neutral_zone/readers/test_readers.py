@@ -2,7 +2,7 @@ import numpy as np
 
 from pyramid.model.events import NumericEventList
 from pyramid.model.model import Buffer, BufferData
-from pyramid.neutral_zone.readers.readers import Reader, ReaderRoute, ReaderRouter, ReaderSyncConfig, ReaderSyncRegistry
+from pyramid.neutral_zone.readers.readers import Reader, ReaderRoute, ReaderRouter, ReaderSyncConfig, ReaderSyncRegistry, SyncEventTimes
 from pyramid.neutral_zone.transformers.standard_transformers import FilterRange, OffsetThenGain
 
 
@@ -144,6 +144,11 @@ def test_router_circuit_breaker_for_reader_errors():
     assert router.route_next() == False
     assert router.named_buffers["one"].data.event_count() == 2
 
+    # Routing until a later time should give up right away, without polling the reader again.
+    reader_index = reader.index
+    assert router.route_until(100) == 1
+    assert reader.index == reader_index
+
 
 def test_router_skip_buffer_append_errors():
     reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20, 200, 2000]], [[3, 30]]])
@@ -258,6 +263,30 @@ def test_route_transforms_data():
     assert router.named_buffers["two"].data == NumericEventList(np.array([[1, -52]]))
 
 
+def test_route_transforms_fan_out_from_one_result():
+    reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
+
+    # Routes with transformers may modify data in place, so list them first to check that other routes still see original data.
+    route_one = ReaderRoute("events", "one", [OffsetThenGain(offset=42, gain=-1)])
+    route_two = ReaderRoute("events", "two", [OffsetThenGain(offset=1, gain=2)])
+    route_three = ReaderRoute("events", "three")
+    routes = [route_one, route_two, route_three]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+
+    assert router.route_next() == True
+    assert router.route_next() == True
+    assert router.route_next() == True
+    assert router.route_next() == False
+
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, -42], [1, -52], [2, -62]]))
+    assert router.named_buffers["two"].data == NumericEventList(np.array([[0, 2], [1, 22], [2, 42]]))
+    assert router.named_buffers["three"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
+
+
 def test_router_skip_transformer_errors():
     reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
     route_one = ReaderRoute("events", "one")
@@ -372,6 +401,34 @@ def test_reader_sync_registry():
     assert sync_registry.get_drift("bar", reference_end_time=end_time, reader_end_time=end_time) == 2.93 - 3.0
 
 
+def test_sync_event_times_grow():
+    event_times = SyncEventTimes(capacity=2)
+    assert len(event_times) == 0
+    assert event_times == []
+
+    # Appending past capacity should grow the underlying array and keep earlier times.
+    for time in range(5):
+        event_times.append(time)
+    assert len(event_times) == 5
+    assert event_times.data.size == 8
+    assert event_times == [0, 1, 2, 3, 4]
+    assert event_times.view().dtype == np.float64
+
+    # Extending past capacity should grow the underlying array enough for all the new times.
+    event_times.extend(np.array([5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17]))
+    assert len(event_times) == 18
+    assert event_times.data.size == 18
+    assert event_times == list(range(18))
+
+    # Extending within capacity should reuse the underlying array.
+    event_times.extend([])
+    assert len(event_times) == 18
+    event_times.append(18)
+    event_times.extend([19, 20])
+    assert event_times.data.size == 36
+    assert event_times == list(range(21))
+
+
 def test_router_records_sync_events_in_registry():
     reader = FakeNumericEventReader([[[0, 0], [0, 42]], [[1, 10], [1, 0]], [[2, 20], [2, 42]]])
     routes = [
@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 
 from pyramid.file_finder import FileFinder
 from pyramid.trials.trials import Trial
-from pyramid.plotters.plotters import Plotter, PlotFigureController, get_figure_position, set_figure_position, looks_like_tkinter
+from pyramid.plotters.plotters import Plotter, PlotFigureController, get_figure_position, set_figure_position, looks_like_tkinter, parse_geometry, format_geometry
 from pyramid.plotters.standard_plotters import NumericEventsPlotter, SignalChunksPlotter
 
 
@@ -247,3 +247,13 @@ def test_record_figure_positions(tmp_path):
         # so there's no figure window to position.
         for position in plot_positions.values():
             assert position is None
+
+
+def test_parse_geometry():
+    assert parse_geometry("640x480+10+20") == {"width": 640, "height": 480, "x": 10, "y": 20}
+
+    # Windows partly off screen can have negative positions.
+    assert parse_geometry("640x480+-10+-20") == {"width": 640, "height": 480, "x": -10, "y": -20}
+
+    position = {"width": 101, "height": 100, "x": 1, "y": 51}
+    assert parse_geometry(format_geometry(position)) == position
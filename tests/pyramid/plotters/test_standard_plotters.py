@@ -10,10 +10,23 @@ from pyramid.plotters.standard_plotters import (
     SignalChunksPlotter,
     EnhancementTimesPlotter,
     EnhancementXYPlotter,
-    SpikeEventsPlotter
+    SpikeEventsPlotter,
+    name_to_color
 )
 
 
+def test_name_to_color():
+    color = name_to_color("foo")
+    assert len(color) == 4
+    assert color[3] == 1.0
+
+    # Colors should be stable for each name and alpha.
+    assert name_to_color("foo") == color
+    faded = name_to_color("foo", 0.125)
+    assert faded[:3] == color[:3]
+    assert faded[3] == 0.125
+
+
 def test_basic_info_plotter():
     trial = Trial(0.0, 1.0, 0.5)
     experiment_info = {
@@ -71,6 +84,66 @@ def test_numeric_events_plotter():
         assert plotter.history[1]["bar"] == trial_1.numeric_events["bar"]
         assert "baz" not in plotter.history[1]
 
+        # Artists for trial 0 should be faded out, and artists for trial 1 should be the latest.
+        # Each trial's events are one collection, plus empty, labeled collections for the legend.
+        assert len(plotter.history_artists.old) == 1
+        assert len(plotter.history_artists.old[0]) == 1
+        assert len(plotter.history_artists.latest) == 3
+        assert len(plotter.ax.collections) == 4
+        assert len(plotter.ax.get_legend().legend_handles) == 2
+
+
+def test_numeric_events_plotter_history_artists():
+    trials = []
+    for index in range(5):
+        trial = Trial(index, index + 1.0, index + 0.5)
+        trial.add_buffer_data("foo", NumericEventList(np.array([[0, index], [1, index]])))
+        trials.append(trial)
+
+    plotter = NumericEventsPlotter(history_size=2)
+    with PlotFigureController([plotter]) as controller:
+        for index, trial in enumerate(trials):
+            controller.plot_next(trial, trial_number=index)
+
+        # Only artists for the history plus the latest trial should remain on the axes.
+        assert len(plotter.history) == 2
+        assert len(plotter.history_artists.old) == 2
+        assert len(plotter.history_artists.latest) == 2
+        assert len(plotter.ax.collections) == 4
+
+        # The axes should rescale to fit remaining artists, not every trial ever plotted.
+        (ymin, ymax) = plotter.ax.get_ylim()
+        assert ymin > 1
+        assert ymax < 5
+
+
+def test_plotters_autoscale_limits_that_are_none():
+    trials = []
+    for index in range(5):
+        trial = Trial(index, index + 1.0, index + 0.5)
+        trial.add_buffer_data("foo", NumericEventList(np.array([[index * 10, index], [index * 10 + 5, index]])))
+        trial.add_enhancement("x", index * 10)
+        trial.add_enhancement("y", index)
+        trials.append(trial)
+
+    events_plotter = NumericEventsPlotter(history_size=2, xmin=None, xmax=None)
+    xy_plotter = EnhancementXYPlotter(xy_points={"x": "y"}, xmin=-2.0, xmax=None)
+    with PlotFigureController([events_plotter, xy_plotter]) as controller:
+        for index, trial in enumerate(trials):
+            controller.plot_next(trial, trial_number=index)
+
+            # Limits that are None should follow the data plotted so far.
+            (events_xmin, events_xmax) = events_plotter.ax.get_xlim()
+            assert events_xmin < max(0, (index - 2) * 10)
+            assert events_xmax > index * 10 + 5
+
+            (xy_xmin, xy_xmax) = xy_plotter.ax.get_xlim()
+            assert xy_xmin == -2.0
+            assert xy_xmax > index * 10
+
+        # Limits that were given should stay put.
+        assert xy_plotter.ax.get_ylim() == (-2.0, 2.0)
+
 
 def test_signal_chunks_plotter():
     trial_0 = Trial(0.0, 1.0, 0.5)
@@ -182,6 +255,10 @@ def test_enhancement_times_plotter():
         assert "baz" not in plotter.history[1]
         assert "quuz" not in plotter.history[1]
 
+        # Each name should keep the plot row where it first appeared.
+        assert plotter.all_names == ["foo", "bar"]
+        assert plotter.name_rows == {"foo": 0, "bar": 1}
+
 
 def test_enhancement_xy_plotter():
     trial_0 = Trial(0.0, 1.0, 0.5)